@@ -2,12 +2,13 @@
 
 from audio.generator import AudioGenerator
 from audio.turn_taking import TurnTakingBenchmark
-from audio.samples import SampleManager, AudioSample, print_sample_info
+from audio.samples import SampleManager, AudioSample, format_sample_info, print_sample_info
 
 __all__ = [
     "AudioGenerator",
     "TurnTakingBenchmark",
     "SampleManager",
     "AudioSample",
+    "format_sample_info",
     "print_sample_info",
 ]
@@ -4,6 +4,7 @@ Audio sample management for PersonaPlex benchmarks.
 Downloads and manages test audio files from the official PersonaPlex repository.
 """
 import os
+import asyncio
 import wave
 import struct
 import logging
@@ -120,6 +121,51 @@ class SampleManager:
 
         return success
 
+    async def download_all_test_files_async(self) -> bool:
+        """
+        Download all PersonaPlex test files concurrently.
+
+        Files already in the cache directory are skipped without touching
+        the network, so repeat runs cost no requests at all. Missing files
+        are fetched in parallel over one HTTP client, so startup is bounded
+        by the slowest download rather than the sum of them.
+        """
+        import httpx
+
+        pending = [
+            (info["url"], self.cache_dir / f"{name}.{ext}")
+            for files, ext in ((PERSONAPLEX_TEST_FILES, "wav"), (PERSONAPLEX_TEST_PROMPTS, "txt"))
+            for name, info in files.items()
+        ]
+        pending = [(url, path) for url, path in pending if not path.exists()]
+        if not pending:
+            logger.debug("All test files cached")
+            return True
+
+        async def fetch(client: httpx.AsyncClient, url: str, filepath: Path):
+            logger.info(f"Downloading: {url}")
+            response = await client.get(url)
+            response.raise_for_status()
+            # Write then rename so an interrupted run never leaves a
+            # truncated file that later runs would treat as cached
+            tmp_path = filepath.with_suffix(filepath.suffix + ".part")
+            tmp_path.write_bytes(response.content)
+            os.replace(tmp_path, filepath)
+            logger.info(f"Downloaded to: {filepath}")
+
+        async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
+            results = await asyncio.gather(
+                *(fetch(client, url, path) for url, path in pending),
+                return_exceptions=True
+            )
+
+        success = True
+        for (url, _), error in zip(pending, results):
+            if isinstance(error, Exception):
+                logger.error(f"Failed to download {url}: {error}")
+                success = False
+        return success
+
     def load_wav_file(self, filepath: str) -> AudioSample:
         """
         Load a WAV file and convert to PersonaPlex format.
@@ -267,10 +313,45 @@ class SampleManager:
 
         return self._samples
 
+    async def load_personaplex_samples_async(self) -> dict[str, AudioSample]:
+        """
+        Async variant of load_personaplex_samples().
+
+        Downloads missing files concurrently, then decodes and converts
+        the WAV files in worker threads so the event loop stays free.
+
+        Returns:
+            Dictionary of sample name -> AudioSample
+        """
+        await self.download_all_test_files_async()
+
+        names = [
+            name for name in PERSONAPLEX_TEST_FILES
+            if (self.cache_dir / f"{name}.wav").exists()
+        ]
+        loaded = await asyncio.gather(
+            *(asyncio.to_thread(self.load_wav_file, self.cache_dir / f"{name}.wav") for name in names),
+            return_exceptions=True
+        )
+        for name, sample in zip(names, loaded):
+            if isinstance(sample, Exception):
+                logger.error(f"Failed to load {name}: {sample}")
+            else:
+                self._samples[name] = sample
+
+        return self._samples
+
+    async def load_personaplex_prompts_async(self) -> dict[str, str]:
+        """Async variant of load_personaplex_prompts()."""
+        await self.download_all_test_files_async()
+        return self._read_cached_prompts()
+
     def load_personaplex_prompts(self) -> dict[str, str]:
         """Load PersonaPlex test prompts."""
         self.download_all_test_files()
+        return self._read_cached_prompts()
 
+    def _read_cached_prompts(self) -> dict[str, str]:
         for name in PERSONAPLEX_TEST_PROMPTS:
             filepath = self.cache_dir / f"{name}.txt"
             if filepath.exists():
@@ -326,13 +407,20 @@ class SampleManager:
         self._prompts.clear()
 
 
+def format_sample_info(sample: AudioSample) -> str:
+    """Format detailed info about an audio sample."""
+    return (
+        f"\nSample: {sample.name}\n"
+        f"  Source: {sample.source_path or 'generated'}\n"
+        f"  Duration: {sample.duration_seconds:.2f}s\n"
+        f"  Sample Rate: {sample.sample_rate}Hz\n"
+        f"  Channels: {sample.channels}\n"
+        f"  Bit Depth: {sample.sample_width * 8}-bit\n"
+        f"  Data Size: {len(sample.data):,} bytes\n"
+        f"  Num Samples: {sample.num_samples:,}"
+    )
+
+
 def print_sample_info(sample: AudioSample):
     """Print detailed info about an audio sample."""
-    print(f"\nSample: {sample.name}")
-    print(f"  Source: {sample.source_path or 'generated'}")
-    print(f"  Duration: {sample.duration_seconds:.2f}s")
-    print(f"  Sample Rate: {sample.sample_rate}Hz")
-    print(f"  Channels: {sample.channels}")
-    print(f"  Bit Depth: {sample.sample_width * 8}-bit")
-    print(f"  Data Size: {len(sample.data):,} bytes")
-    print(f"  Num Samples: {sample.num_samples:,}")
+    print(format_sample_info(sample))
@@ -10,10 +10,11 @@ Based on FullDuplexBench metrics from PersonaPlex paper:
 """
 import asyncio
 import time
-import statistics
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+import numpy as np
+
 from audio.generator import AudioGenerator
 from core.metrics import MetricsCollector, RequestMetrics, BenchmarkResult
 
@@ -43,35 +44,29 @@ class TurnTakingMetrics:
         result = {}
 
         if self.smooth_latencies:
+            smooth = np.asarray(self.smooth_latencies, dtype=np.float64)
+            median, p90 = np.percentile(smooth, [50, 90])
             result["smooth_turn_taking"] = {
-                "mean_ms": statistics.mean(self.smooth_latencies),
-                "median_ms": statistics.median(self.smooth_latencies),
-                "min_ms": min(self.smooth_latencies),
-                "max_ms": max(self.smooth_latencies),
-                "p90_ms": self._percentile(self.smooth_latencies, 90),
-                "count": len(self.smooth_latencies),
+                "mean_ms": float(smooth.mean()),
+                "median_ms": float(median),
+                "min_ms": float(smooth.min()),
+                "max_ms": float(smooth.max()),
+                "p90_ms": float(p90),
+                "count": len(smooth),
             }
 
         if self.interruption_latencies:
+            interruption = np.asarray(self.interruption_latencies, dtype=np.float64)
+            median, p90 = np.percentile(interruption, [50, 90])
             result["interruption_handling"] = {
-                "mean_ms": statistics.mean(self.interruption_latencies),
-                "median_ms": statistics.median(self.interruption_latencies),
-                "p90_ms": self._percentile(self.interruption_latencies, 90),
-                "count": len(self.interruption_latencies),
+                "mean_ms": float(interruption.mean()),
+                "median_ms": float(median),
+                "p90_ms": float(p90),
+                "count": len(interruption),
             }
 
         return result
 
-    def _percentile(self, data: List[float], p: int) -> float:
-        """Calculate percentile."""
-        if not data:
-            return 0.0
-        sorted_data = sorted(data)
-        k = (len(sorted_data) - 1) * (p / 100)
-        f = int(k)
-        c = min(f + 1, len(sorted_data) - 1)
-        return sorted_data[f] + (sorted_data[c] - sorted_data[f]) * (k - f)
-
 
 class TurnTakingBenchmark:
     """
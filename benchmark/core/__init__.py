@@ -7,6 +7,7 @@ from core.metrics import (
     MetricsCollector,
     audio_to_tokens,
     bytes_to_audio_duration,
+    bytes_to_audio_duration_default,
     MOSHI_SEMANTIC_TOKEN_RATE,
     MOSHI_SAMPLE_RATE,
 )
@@ -17,6 +18,7 @@ from core.personaplex_client import (
 )
 from core.system_metrics import (
     SystemMetricsCollector,
+    ProcessMetricsCollector,
     MetricsSummary,
     GPUInfo,
     GPUMetrics,
@@ -26,6 +28,7 @@ from core.pipeline_client import (
     PipelineConfig,
     PipelineBenchmarkClient,
     check_backend_health,
+    close_http,
 )
 
 from core.direct_client import (
@@ -43,6 +46,7 @@ __all__ = [
     "PersonaPlexBenchmarkClient",
     "MockPersonaPlexClient",
     "SystemMetricsCollector",
+    "ProcessMetricsCollector",
     "MetricsSummary",
     "GPUInfo",
     "GPUMetrics",
@@ -0,0 +1,46 @@
+"""
+Audio scanning kernels used by benchmark preprocessing.
+
+first_voiced() is compiled with numba when it is installed, fusing the
+threshold compare and the search into one pass that stops at the first
+hit. Without numba it falls back to a vectorized numpy scan.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _first_voiced_loop(samples, threshold):
+    for i in range(samples.shape[0]):
+        v = samples[i]
+        if v > threshold or v < -threshold:
+            return i
+    return -1
+
+
+def _first_voiced_numpy(samples: np.ndarray, threshold: int) -> int:
+    voiced = np.abs(samples) > threshold
+    return int(np.argmax(voiced)) if voiced.any() else -1
+
+
+if njit is not None:
+    _first_voiced = njit(cache=True, boundscheck=False)(_first_voiced_loop)
+else:
+    _first_voiced = _first_voiced_numpy
+
+
+def first_voiced(samples: np.ndarray, threshold: int) -> int:
+    """
+    Find the first sample whose amplitude exceeds a threshold.
+
+    Args:
+        samples: int16 PCM samples
+        threshold: Amplitude threshold for speech detection
+
+    Returns:
+        Index of the first voiced sample, or -1 if there is none
+    """
+    return int(_first_voiced(samples, threshold))
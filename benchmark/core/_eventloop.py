@@ -0,0 +1,36 @@
+"""
+Event loop setup shared by the benchmark entry points.
+
+uvloop is an optional dependency; when it is installed every await on
+websocket/HTTP I/O and asyncio.sleep goes through libuv instead of the
+stdlib selector loop.
+"""
+import asyncio
+
+
+def install_uvloop() -> bool:
+    """
+    Install uvloop as the asyncio event loop policy if available.
+
+    Must be called before asyncio.run().
+
+    Returns:
+        True if uvloop was installed, False if it is not available
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    uvloop.install()
+    return True
+
+
+def running_loop_name() -> str:
+    """
+    Name of the running event loop implementation.
+
+    Returns:
+        Top-level module of the loop class, e.g. "uvloop" or "asyncio"
+    """
+    return type(asyncio.get_running_loop()).__module__.partition(".")[0]
@@ -7,19 +7,29 @@ to measure raw model latency without backend overhead.
 import asyncio
 import time
 import logging
-from typing import Optional, Callable
-from dataclasses import dataclass
+from typing import Optional, Callable, List
+from dataclasses import dataclass, field
 from urllib.parse import urlencode
 import numpy as np
 
-from core.metrics import MetricsCollector, RequestMetrics, audio_to_tokens, bytes_to_audio_duration
+from core.metrics import MetricsCollector, RequestMetrics, audio_to_tokens
+from core._audio_kernels import first_voiced
 
 logger = logging.getLogger(__name__)
 
+# Audio is streamed in real-time chunks of 80ms (1920 samples at 24kHz)
+_CHUNK_SAMPLES = 1920
+
 
 @dataclass
 class DirectConfig:
-    """Configuration for direct PersonaPlex benchmark."""
+    """
+    Configuration for direct PersonaPlex benchmark.
+
+    Receive timeouts use asyncio.timeout(), which requires Python 3.11+.
+    The CLI entry points install uvloop when it is available; the client
+    itself works on either event loop.
+    """
     host: str = "localhost"
     port: int = 8998
     use_ssl: bool = False
@@ -37,6 +47,19 @@ class DirectConfig:
         return f"{protocol}://{self.host}:{self.port}/api/chat"
 
 
+@dataclass
+class _ResponseState:
+    """Per-request receive state shared by the message kind handlers."""
+    collector: MetricsCollector
+    send_time: int  # time.perf_counter_ns()
+    on_audio: Optional[Callable[[bytes], None]] = None
+    on_text: Optional[Callable[[str], None]] = None
+    first_response_time: Optional[int] = None
+    audio_chunks: int = 0
+    text_tokens: List[str] = field(default_factory=list)
+    debug: bool = False
+
+
 class DirectBenchmarkClient:
     """
     Direct benchmark client for PersonaPlex.
@@ -51,9 +74,14 @@ class DirectBenchmarkClient:
         self._connected = False
         self.opus_writer = None
         self.opus_reader = None
+        self._kind_handlers = {}
+        # Set when the socket opened but no handshake came in time: the
+        # server is still holding its one session for another connection
+        self.session_busy = False
 
     async def connect(self) -> bool:
         """Connect directly to PersonaPlex with config in URL."""
+        self.session_busy = False
         try:
             import websockets
             import sphn
@@ -62,6 +90,12 @@ class DirectBenchmarkClient:
             self.opus_writer = sphn.OpusStreamWriter(24000)
             self.opus_reader = sphn.OpusStreamReader(24000)
 
+            # Dispatch table keyed by the message kind byte
+            self._kind_handlers = {
+                1: self._on_audio_msg,
+                2: self._on_text_msg,
+            }
+
             # Build URL with text_prompt in query params
             query_params = {'text_prompt': self.config.text_prompt}
             ws_url = f"{self.config.ws_url}?{urlencode(query_params)}"
@@ -91,6 +125,15 @@ class DirectBenchmarkClient:
 
         except Exception as e:
             logger.error(f"Failed to connect to PersonaPlex: {e}")
+            # An open socket left waiting on the handshake stays queued for
+            # the server's session lock and would block the next session
+            if self.ws is not None:
+                self.session_busy = isinstance(e, asyncio.TimeoutError)
+                try:
+                    await self.ws.close()
+                except Exception:
+                    pass
+                self.ws = None
             self._connected = False
             return False
 
@@ -101,23 +144,99 @@ class DirectBenchmarkClient:
                 await self.ws.close()
             except:
                 pass
+            self.ws = None
         self._connected = False
 
+    def _on_audio_msg(self, payload: bytes, now: int, state: _ResponseState):
+        """Handle an audio message (kind 1)."""
+        if not payload:
+            return
+
+        if state.first_response_time is None:
+            state.first_response_time = now
+            ttft = (now - state.send_time) / 1e6
+            logger.info(f"First audio at {ttft:.1f}ms")
+            state.collector.record_turn_taking(state.send_time / 1e9, now / 1e9)
+
+        state.audio_chunks += 1
+        state.collector.record_token(f"[audio_{state.audio_chunks}]")
+
+        if state.on_audio and self.opus_reader:
+            pcm = self.opus_reader.append_bytes(payload)
+            if pcm.shape[-1] > 0:
+                pcm_int16 = (pcm * 32767).astype(np.int16)
+                state.on_audio(pcm_int16.tobytes())
+
+    def _on_text_msg(self, payload: bytes, now: int, state: _ResponseState):
+        """Handle a text token message (kind 2)."""
+        text = payload.decode('utf-8', errors='ignore')
+        if not text.strip():
+            return
+
+        if state.first_response_time is None:
+            state.first_response_time = now
+            state.collector.record_turn_taking(state.send_time / 1e9, now / 1e9)
+
+        state.text_tokens.append(text)
+        state.collector.record_token(text)
+        if state.debug:
+            logger.debug("Text: %s", text)
+
+        if state.on_text:
+            state.on_text(text)
+
+    @staticmethod
+    def prepare_audio(audio_data: bytes) -> np.ndarray:
+        """
+        Select and convert the region of a clip that is streamed to PersonaPlex.
+
+        Skips initial silence (keeping 0.5s before the first speech), caps
+        the result at 10 seconds, converts it to float32 for the Opus encoder
+        and zero-pads it to whole 80ms chunks. Call once per clip, outside
+        the timed region, and pass the result to benchmark_audio_response()
+        with prepared=True.
+
+        Args:
+            audio_data: PCM audio bytes (24kHz, 16-bit, mono)
+
+        Returns:
+            float32 samples in [-1, 1), a whole number of chunks long
+        """
+        samples = np.frombuffer(audio_data, dtype=np.int16)
+
+        # Find speech start (skip silence)
+        first_speech = first_voiced(samples, 500)
+        start_sample = max(0, first_speech - 12000) if first_speech >= 0 else 0
+
+        # Use 10 seconds of audio from speech start
+        end_sample = min(start_sample + 10 * 24000, len(samples))
+        n_samples = end_sample - start_sample
+
+        speech_samples = np.zeros(-(-n_samples // _CHUNK_SAMPLES) * _CHUNK_SAMPLES, dtype=np.float32)
+        speech_samples[:n_samples] = samples[start_sample:end_sample]
+        speech_samples /= 32768.0
+
+        logger.info(f"Sending {n_samples / 24000:.1f}s of audio directly to PersonaPlex")
+        return speech_samples
+
     async def benchmark_audio_response(
         self,
         request_id: str,
-        audio_data: bytes,
+        audio_data,
         on_audio: Optional[Callable[[bytes], None]] = None,
-        on_text: Optional[Callable[[str], None]] = None
+        on_text: Optional[Callable[[str], None]] = None,
+        prepared: bool = False
     ) -> RequestMetrics:
         """
         Benchmark a single audio request directly to PersonaPlex.
 
         Args:
             request_id: Unique identifier for this request
-            audio_data: PCM audio bytes (24kHz, 16-bit, mono)
+            audio_data: PCM audio bytes (24kHz, 16-bit, mono), or the output
+                of prepare_audio() when prepared is set
             on_audio: Callback for each audio chunk received
             on_text: Callback for each text token received
+            prepared: audio_data was already converted with prepare_audio()
 
         Returns:
             RequestMetrics with timing data
@@ -125,8 +244,12 @@ class DirectBenchmarkClient:
         if not self._connected or not self.ws:
             raise RuntimeError("Not connected to PersonaPlex")
 
-        # Calculate input tokens from audio duration (Moshi uses 12.5 Hz semantic tokenizer)
-        audio_duration = bytes_to_audio_duration(len(audio_data))
+        # Silence trimming and float conversion happen before the timed region
+        speech_samples = audio_data if prepared else self.prepare_audio(audio_data)
+
+        # Calculate input tokens from audio duration (Moshi uses 12.5 Hz semantic tokenizer).
+        # Only the streamed region is counted, whether or not it was prepared here
+        audio_duration = len(speech_samples) / 24000
         prompt_tokens = audio_to_tokens(audio_duration)
 
         collector = MetricsCollector(
@@ -136,84 +259,40 @@ class DirectBenchmarkClient:
         )
 
         try:
-            # Convert PCM to float32 for Opus encoding
-            samples = np.frombuffer(audio_data, dtype=np.int16)
-
-            # Find speech start (skip silence)
-            threshold = 500
-            non_silent = np.where(np.abs(samples) > threshold)[0]
-            if len(non_silent) > 0:
-                start_sample = max(0, non_silent[0] - 12000)
-            else:
-                start_sample = 0
-
-            # Use 10 seconds of audio from speech start
-            end_sample = min(start_sample + 10 * 24000, len(samples))
-            speech_samples = samples[start_sample:end_sample].astype(np.float32) / 32768.0
-
-            logger.info(f"Sending {len(speech_samples)/24000:.1f}s of audio directly to PersonaPlex")
-
             # Start timing
             collector.start()
-            send_time = time.time()
+            send_time = time.perf_counter_ns()
 
-            # Stream audio in real-time chunks (80ms = 1920 samples)
-            chunk_samples = 1920
+            # Stream audio in real-time chunks
+            chunk_samples = _CHUNK_SAMPLES
             chunk_time = chunk_samples / 24000
 
-            first_response_time = None
-            audio_chunks = 0
-            text_tokens = []
+            state = _ResponseState(
+                collector=collector,
+                send_time=send_time,
+                on_audio=on_audio,
+                on_text=on_text,
+                debug=logger.isEnabledFor(logging.DEBUG),
+            )
+            kind_handlers = self._kind_handlers
 
             async def receive_responses():
-                nonlocal first_response_time, audio_chunks, text_tokens
-
                 while True:
                     try:
-                        msg = await asyncio.wait_for(
-                            self.ws.recv(),
-                            timeout=self.config.response_timeout
-                        )
-
-                        now = time.time()
-
-                        if isinstance(msg, bytes) and len(msg) > 0:
-                            kind = msg[0]
-                            payload = msg[1:]
-
-                            if kind == 1 and len(payload) > 0:  # Audio
-                                if first_response_time is None:
-                                    first_response_time = now
-                                    ttft = (now - send_time) * 1000
-                                    logger.info(f"First audio at {ttft:.1f}ms")
-                                    collector.record_turn_taking(send_time, now)
-
-                                audio_chunks += 1
-                                collector.record_token(f"[audio_{audio_chunks}]")
-
-                                if on_audio and self.opus_reader:
-                                    pcm = self.opus_reader.append_bytes(payload)
-                                    if pcm.shape[-1] > 0:
-                                        pcm_int16 = (pcm * 32767).astype(np.int16)
-                                        on_audio(pcm_int16.tobytes())
-
-                            elif kind == 2:  # Text
-                                text = payload.decode('utf-8', errors='ignore')
-                                if text.strip():
-                                    if first_response_time is None:
-                                        first_response_time = now
-                                        collector.record_turn_taking(send_time, now)
-
-                                    text_tokens.append(text)
-                                    collector.record_token(text)
-                                    logger.debug(f"Text: {text}")
-
-                                    if on_text:
-                                        on_text(text)
+                        async with asyncio.timeout(self.config.response_timeout):
+                            msg = await self.ws.recv()
+
+                        now = time.perf_counter_ns()
+
+                        # Text frames never match an int kind, so no type check needed
+                        if msg:
+                            handler = kind_handlers.get(msg[0])
+                            if handler is not None:
+                                handler(msg[1:], now, state)
 
                         # Check if we have enough response
                         elapsed = now - send_time
-                        if elapsed > 3.0 and (audio_chunks > 10 or len(text_tokens) > 10):
+                        if elapsed > 3_000_000_000 and (state.audio_chunks > 10 or len(state.text_tokens) > 10):
                             return True
 
                     except asyncio.TimeoutError:
@@ -227,26 +306,23 @@ class DirectBenchmarkClient:
             recv_task = asyncio.create_task(receive_responses())
 
             # Stream audio chunks
+            # speech_samples is padded to whole chunks, so every slice is full
             for i in range(0, len(speech_samples), chunk_samples):
-                chunk = speech_samples[i:i+chunk_samples]
-                if len(chunk) < chunk_samples:
-                    chunk = np.pad(chunk, (0, chunk_samples - len(chunk)))
-
-                opus_data = self.opus_writer.append_pcm(chunk)
+                opus_data = self.opus_writer.append_pcm(speech_samples[i:i + chunk_samples])
                 if len(opus_data) > 0:
                     await self.ws.send(b'\x01' + opus_data)
 
                 await asyncio.sleep(chunk_time)
 
-            user_stop_time = time.time()
-            logger.info(f"Audio streaming complete after {(user_stop_time - send_time)*1000:.1f}ms")
+            user_stop_time = time.perf_counter_ns()
+            logger.info(f"Audio streaming complete after {(user_stop_time - send_time) / 1e6:.1f}ms")
 
             # Wait for responses
             success = await recv_task
 
-            logger.info(f"Received {audio_chunks} audio chunks, {len(text_tokens)} text tokens")
-            if text_tokens:
-                logger.info(f"Response: {''.join(text_tokens)}")
+            logger.info(f"Received {state.audio_chunks} audio chunks, {len(state.text_tokens)} text tokens")
+            if state.text_tokens:
+                logger.info(f"Response: {''.join(state.text_tokens)}")
 
             return collector.end(success=success)
 
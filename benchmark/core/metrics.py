@@ -13,12 +13,31 @@ Audio-specific metrics (FullDuplexBench):
 - User Interruption Latency
 """
 import time
-import statistics
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 
+import numpy as np
+
+try:
+    from crick import TDigest
+except ImportError:
+    TDigest = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from hdrh.histogram import HdrHistogram
+except ImportError:
+    HdrHistogram = None
+
+# Bound once so record_token() skips the module attribute lookup
+_perf_counter_ns = time.perf_counter_ns
+
 
 # Moshi/PersonaPlex audio tokenization rates
 MOSHI_SEMANTIC_TOKEN_RATE = 12.5  # Semantic tokens per second (main tokens)
@@ -61,32 +80,110 @@ def bytes_to_audio_duration(audio_bytes: int, sample_rate: int = MOSHI_SAMPLE_RA
     return num_samples / sample_rate
 
 
-@dataclass
+# Seconds per byte of 16-bit mono PCM at MOSHI_SAMPLE_RATE
+_DEFAULT_BYTES_TO_SECONDS = 1.0 / ((16 // 8) * 1 * MOSHI_SAMPLE_RATE)
+
+
+def bytes_to_audio_duration_default(audio_bytes: int) -> float:
+    """
+    Calculate duration of 16-bit mono PCM at 24kHz from byte count.
+
+    Equivalent to bytes_to_audio_duration() with default arguments (up to
+    float rounding), computed as a single multiply.
+
+    Args:
+        audio_bytes: Number of bytes
+
+    Returns:
+        Duration in seconds
+    """
+    return audio_bytes * _DEFAULT_BYTES_TO_SECONDS
+
+
+class StreamingStat:
+    """
+    Streaming summary of a single latency series.
+
+    Tracks count, mean, variance (Welford), min and max in O(1) memory.
+    Quantiles come from a t-digest when crick is installed; otherwise the
+    raw samples are kept in a preallocated float64 buffer (doubled when
+    full) so exact percentiles can be computed without a list copy.
+    """
+
+    INITIAL_CAPACITY = 256
+
+    __slots__ = ("count", "mean", "_m2", "min", "max", "_digest", "_samples")
+
+    def __init__(self, compression: int = 500):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self._digest = TDigest(compression) if TDigest is not None else None
+        self._samples: Optional[np.ndarray] = (
+            np.empty(self.INITIAL_CAPACITY, dtype=np.float64) if self._digest is None else None
+        )
+
+    def update(self, value: float):
+        """Add a sample."""
+        n = self.count
+        self.count = n + 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if self._digest is not None:
+            self._digest.update(value)
+        else:
+            samples = self._samples
+            if n == samples.shape[0]:
+                samples = self._samples = np.resize(samples, n * 2)
+            samples[n] = value
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation."""
+        return (self._m2 / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+
+    def percentiles(self, ps: List[float]) -> List[float]:
+        """Get the given percentiles (0-100)."""
+        if not self.count:
+            return [0.0] * len(ps)
+        if self._digest is not None:
+            return [float(self._digest.quantile(p / 100)) for p in ps]
+        # np.percentile selects with an O(n) partition rather than a full sort
+        return list(np.percentile(self._samples[:self.count], ps, method="linear"))
+
+
+@dataclass(slots=True)
 class TokenEvent:
     """Single token generation event."""
     token_id: int
     token_text: str
-    timestamp: float  # Unix timestamp in seconds
-    is_first: bool = False
-    is_last: bool = False
+    timestamp: int  # time.perf_counter_ns() reading
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestMetrics:
     """Metrics for a single request/response cycle."""
     request_id: str
     prompt: str
     prompt_tokens: int
 
-    # Timestamps
-    request_start: float = 0.0
-    first_token_time: float = 0.0
-    last_token_time: float = 0.0
-    request_end: float = 0.0
+    # Timestamps (time.perf_counter_ns() readings)
+    request_start: int = 0
+    first_token_time: int = 0
+    last_token_time: int = 0
+    request_end: int = 0
 
     # Token data
     output_tokens: int = 0
-    token_events: List[TokenEvent] = field(default_factory=list)
+    token_timestamps: Optional[np.ndarray] = field(default=None, repr=False)
 
     # Computed metrics (populated by compute_metrics())
     ttft: float = 0.0  # Time to First Token
@@ -106,10 +203,10 @@ class RequestMetrics:
     def compute_metrics(self):
         """Compute derived metrics from raw measurements."""
         if self.request_start and self.first_token_time:
-            self.ttft = self.first_token_time - self.request_start
+            self.ttft = (self.first_token_time - self.request_start) / 1e9
 
         if self.request_start and self.request_end:
-            self.e2e_latency = self.request_end - self.request_start
+            self.e2e_latency = (self.request_end - self.request_start) / 1e9
 
         # Inter-token latency: (e2e_latency - ttft) / (output_tokens - 1)
         if self.output_tokens > 1 and self.ttft > 0:
@@ -120,6 +217,16 @@ class RequestMetrics:
         if self.e2e_latency > 0 and self.output_tokens > 0:
             self.tps = self.output_tokens / self.e2e_latency
 
+    @property
+    def token_events(self) -> List[TokenEvent]:
+        """Token events rebuilt from the recorded timestamps."""
+        if self.token_timestamps is None:
+            return []
+        return [
+            TokenEvent(token_id=i, token_text="", timestamp=int(ts))
+            for i, ts in enumerate(self.token_timestamps)
+        ]
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return {
@@ -127,17 +234,18 @@ class RequestMetrics:
             "prompt": self.prompt[:100] + "..." if len(self.prompt) > 100 else self.prompt,
             "prompt_tokens": self.prompt_tokens,
             "output_tokens": self.output_tokens,
-            "ttft_ms": round(self.ttft * 1000, 2),
-            "e2e_latency_ms": round(self.e2e_latency * 1000, 2),
-            "itl_ms": round(self.itl * 1000, 2),
-            "tps": round(self.tps, 2),
-            "turn_taking_latency_ms": round(self.turn_taking_latency * 1000, 2) if self.turn_taking_latency else None,
+            # Unrounded; rounding is only applied to the aggregate sections
+            "ttft_ms": self.ttft * 1000,
+            "e2e_latency_ms": self.e2e_latency * 1000,
+            "itl_ms": self.itl * 1000,
+            "tps": self.tps,
+            "turn_taking_latency_ms": self.turn_taking_latency * 1000 if self.turn_taking_latency else None,
             "success": self.success,
             "error": self.error,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class BenchmarkResult:
     """Aggregated benchmark results across multiple requests."""
     name: str
@@ -148,7 +256,8 @@ class BenchmarkResult:
     # Configuration
     config: Dict[str, Any] = field(default_factory=dict)
 
-    # Raw request data
+    # Raw request data (only kept when retain_requests is set)
+    retain_requests: bool = False
     requests: List[RequestMetrics] = field(default_factory=list)
 
     # Aggregated metrics
@@ -189,65 +298,97 @@ class BenchmarkResult:
     turn_taking_latency_mean: float = 0.0
     turn_taking_latency_p90: float = 0.0
 
+    # Per-token inter-token gaps (ms), only populated when hdrh is installed
+    token_itl_p50: float = 0.0
+    token_itl_p90: float = 0.0
+    token_itl_p95: float = 0.0
+    token_itl_p99: float = 0.0
+
+    # Streaming aggregators (milliseconds), updated in add_request()
+    _ttft_stat: StreamingStat = field(default_factory=StreamingStat, init=False, repr=False)
+    _e2e_stat: StreamingStat = field(default_factory=StreamingStat, init=False, repr=False)
+    _itl_stat: StreamingStat = field(default_factory=StreamingStat, init=False, repr=False)
+    _turn_taking_stat: StreamingStat = field(default_factory=StreamingStat, init=False, repr=False)
+    # HDR histogram of token gaps in ns (1 ns to 60 s, 3 significant figures)
+    _token_itl_hdr: Any = field(default=None, init=False, repr=False)
+
     def add_request(self, request: RequestMetrics):
         """Add a request and update aggregates."""
         request.compute_metrics()
-        self.requests.append(request)
+        if self.retain_requests:
+            self.requests.append(request)
         self.total_requests += 1
 
-        if request.success:
-            self.successful_requests += 1
-        else:
+        if not request.success:
             self.failed_requests += 1
+            return
+
+        self.successful_requests += 1
+        self.total_prompt_tokens += request.prompt_tokens
+        self.total_output_tokens += request.output_tokens
+
+        if request.ttft > 0:
+            self._ttft_stat.update(request.ttft * 1000)
+        if request.e2e_latency > 0:
+            self._e2e_stat.update(request.e2e_latency * 1000)
+        if request.itl > 0:
+            self._itl_stat.update(request.itl * 1000)
+        if request.turn_taking_latency > 0:
+            self._turn_taking_stat.update(request.turn_taking_latency * 1000)
+
+        timestamps = request.token_timestamps
+        if HdrHistogram is not None and timestamps is not None and len(timestamps) > 1:
+            if self._token_itl_hdr is None:
+                self._token_itl_hdr = HdrHistogram(1, 60_000_000_000, 3)
+            record_value = self._token_itl_hdr.record_value
+            for gap in np.diff(timestamps).tolist():
+                record_value(gap)
 
     def compute_aggregates(self):
         """Compute aggregate statistics from all requests."""
-        self.end_time = datetime.utcnow()
+        self.end_time = datetime.now(timezone.utc)
 
-        successful = [r for r in self.requests if r.success]
-        if not successful:
+        if not self.successful_requests:
             return
 
-        # Extract metric arrays
-        ttfts = [r.ttft * 1000 for r in successful if r.ttft > 0]  # Convert to ms
-        e2e_latencies = [r.e2e_latency * 1000 for r in successful if r.e2e_latency > 0]
-        itls = [r.itl * 1000 for r in successful if r.itl > 0]
-        turn_taking = [r.turn_taking_latency * 1000 for r in successful if r.turn_taking_latency > 0]
-
         # TTFT statistics
-        if ttfts:
-            self.ttft_mean = statistics.mean(ttfts)
-            self.ttft_median = statistics.median(ttfts)
-            self.ttft_p50 = self._percentile(ttfts, 50)
-            self.ttft_p90 = self._percentile(ttfts, 90)
-            self.ttft_p95 = self._percentile(ttfts, 95)
-            self.ttft_p99 = self._percentile(ttfts, 99)
-            self.ttft_min = min(ttfts)
-            self.ttft_max = max(ttfts)
+        ttft = self._ttft_stat
+        if ttft.count:
+            self.ttft_p50, self.ttft_p90, self.ttft_p95, self.ttft_p99 = ttft.percentiles([50, 90, 95, 99])
+            self.ttft_mean = ttft.mean
+            self.ttft_median = self.ttft_p50
+            self.ttft_min = ttft.min
+            self.ttft_max = ttft.max
 
         # E2E latency statistics
-        if e2e_latencies:
-            self.e2e_latency_mean = statistics.mean(e2e_latencies)
-            self.e2e_latency_median = statistics.median(e2e_latencies)
-            self.e2e_latency_p90 = self._percentile(e2e_latencies, 90)
-            self.e2e_latency_p95 = self._percentile(e2e_latencies, 95)
-            self.e2e_latency_p99 = self._percentile(e2e_latencies, 99)
+        e2e = self._e2e_stat
+        if e2e.count:
+            self.e2e_latency_median, self.e2e_latency_p90, self.e2e_latency_p95, self.e2e_latency_p99 = e2e.percentiles(
+                [50, 90, 95, 99]
+            )
+            self.e2e_latency_mean = e2e.mean
 
         # ITL statistics
-        if itls:
-            self.itl_mean = statistics.mean(itls)
-            self.itl_median = statistics.median(itls)
-            self.itl_p90 = self._percentile(itls, 90)
-            self.itl_p95 = self._percentile(itls, 95)
+        itl = self._itl_stat
+        if itl.count:
+            self.itl_median, self.itl_p90, self.itl_p95 = itl.percentiles([50, 90, 95])
+            self.itl_mean = itl.mean
 
         # Turn-taking latency
-        if turn_taking:
-            self.turn_taking_latency_mean = statistics.mean(turn_taking)
-            self.turn_taking_latency_p90 = self._percentile(turn_taking, 90)
-
-        # Throughput calculations
-        self.total_prompt_tokens = sum(r.prompt_tokens for r in successful)
-        self.total_output_tokens = sum(r.output_tokens for r in successful)
+        turn_taking = self._turn_taking_stat
+        if turn_taking.count:
+            self.turn_taking_latency_p90, = turn_taking.percentiles([90])
+            self.turn_taking_latency_mean = turn_taking.mean
+
+        # Per-token ITL from the HDR histogram
+        hdr = self._token_itl_hdr
+        if hdr is not None:
+            self.token_itl_p50 = hdr.get_value_at_percentile(50) / 1e6
+            self.token_itl_p90 = hdr.get_value_at_percentile(90) / 1e6
+            self.token_itl_p95 = hdr.get_value_at_percentile(95) / 1e6
+            self.token_itl_p99 = hdr.get_value_at_percentile(99) / 1e6
+
+        # Throughput calculations (token totals are accumulated in add_request)
         self.total_tokens = self.total_prompt_tokens + self.total_output_tokens
 
         # Calculate total benchmark duration
@@ -258,18 +399,14 @@ class BenchmarkResult:
                 self.tokens_per_minute = self.tokens_per_second * 60
                 self.requests_per_second = self.successful_requests / duration_seconds
 
-    def _percentile(self, data: List[float], p: int) -> float:
-        """Calculate percentile value."""
-        if not data:
-            return 0.0
-        sorted_data = sorted(data)
-        k = (len(sorted_data) - 1) * (p / 100)
-        f = int(k)
-        c = f + 1 if f + 1 < len(sorted_data) else f
-        return sorted_data[f] + (sorted_data[c] - sorted_data[f]) * (k - f)
-
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
+        result = self._header_dict()
+        result["requests"] = [r.to_dict() for r in self.requests]
+        return result
+
+    def _header_dict(self) -> Dict[str, Any]:
+        """Aggregate sections of to_dict(), without the per-request list."""
         return {
             "benchmark": {
                 "name": self.name,
@@ -313,6 +450,12 @@ class BenchmarkResult:
                     "mean": round(self.turn_taking_latency_mean, 2),
                     "p90": round(self.turn_taking_latency_p90, 2),
                 } if self.turn_taking_latency_mean > 0 else None,
+                "token_itl": {
+                    "p50": round(self.token_itl_p50, 2),
+                    "p90": round(self.token_itl_p90, 2),
+                    "p95": round(self.token_itl_p95, 2),
+                    "p99": round(self.token_itl_p99, 2),
+                } if self._token_itl_hdr is not None else None,
             },
             "throughput": {
                 "total_tokens": self.total_tokens,
@@ -322,13 +465,45 @@ class BenchmarkResult:
                 "tokens_per_minute": round(self.tokens_per_minute, 2),
                 "requests_per_second": round(self.requests_per_second, 4),
             },
-            "requests": [r.to_dict() for r in self.requests],
         }
 
-    def to_json(self, indent: int = 2) -> str:
-        """Convert to JSON string."""
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Convert to JSON string (uses orjson when installed)."""
+        if orjson is not None and indent in (2, None):
+            option = orjson.OPT_SERIALIZE_NUMPY
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(self.to_dict(), option=option).decode()
         return json.dumps(self.to_dict(), indent=indent)
 
+    def write_jsonl(self, path: str, include_header: bool = True):
+        """
+        Stream results to a JSON Lines file.
+
+        The first line holds the aggregate sections; each following line
+        is one retained request, so per-request dicts are never all held
+        in memory at once.
+
+        Args:
+            path: Output file path
+            include_header: Write the aggregate line; without it the file
+                holds only the per-request lines
+        """
+        if orjson is not None:
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+
+            def dumps_line(obj) -> bytes:
+                return orjson.dumps(obj, option=option)
+        else:
+            def dumps_line(obj) -> bytes:
+                return json.dumps(obj).encode() + b"\n"
+
+        with open(path, "wb") as f:
+            if include_header:
+                f.write(dumps_line(self._header_dict()))
+            for request in self.requests:
+                f.write(dumps_line(request.to_dict()))
+
     def print_summary(self):
         """Print a human-readable summary."""
         print("\n" + "=" * 70)
@@ -385,7 +560,17 @@ class BenchmarkResult:
 
 
 class MetricsCollector:
-    """Real-time metrics collector for streaming responses."""
+    """
+    Real-time metrics collector for streaming responses.
+
+    Timestamps are monotonic time.perf_counter_ns() readings; token
+    timestamps go into a preallocated int64 buffer that doubles when full,
+    so recording a token is a clock read and an array store.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    __slots__ = ("metrics", "_timestamps", "_n")
 
     def __init__(self, request_id: str, prompt: str, prompt_tokens: int = 0):
         self.metrics = RequestMetrics(
@@ -393,38 +578,65 @@ class MetricsCollector:
             prompt=prompt,
             prompt_tokens=prompt_tokens
         )
-        self._token_count = 0
+        self._timestamps = np.empty(self.INITIAL_CAPACITY, dtype=np.int64)
+        self._n = 0
 
     def start(self):
         """Mark the start of the request."""
-        self.metrics.request_start = time.time()
-
-    def record_token(self, token_text: str, token_id: int = 0):
-        """Record a token generation event."""
-        now = time.time()
-        self._token_count += 1
-
-        is_first = self._token_count == 1
-        if is_first:
-            self.metrics.first_token_time = now
-
-        self.metrics.token_events.append(TokenEvent(
-            token_id=token_id,
-            token_text=token_text,
-            timestamp=now,
-            is_first=is_first
-        ))
-        self.metrics.output_tokens = self._token_count
-        self.metrics.last_token_time = now
+        self.metrics.request_start = time.perf_counter_ns()
+
+    def record_token(self, token_text: str = "", token_id: int = 0):
+        """
+        Record a token generation event.
+
+        Only the arrival time is kept, so callers that have not decoded the
+        token can leave token_text out.
+        """
+        n = self._n
+        timestamps = self._timestamps
+        if n == timestamps.shape[0]:
+            timestamps = self._timestamps = np.resize(timestamps, n * 2)
+        timestamps[n] = _perf_counter_ns()
+        self._n = n + 1
+
+    def record_audio_chunks(self, timestamps: List[int]):
+        """
+        Record a batch of audio chunk arrivals at once.
+
+        Args:
+            timestamps: time.perf_counter_ns() readings, in arrival order
+        """
+        k = len(timestamps)
+        if not k:
+            return
+        n = self._n
+        needed = n + k
+        buf = self._timestamps
+        if needed > buf.shape[0]:
+            capacity = buf.shape[0]
+            while capacity < needed:
+                capacity *= 2
+            buf = self._timestamps = np.resize(buf, capacity)
+        buf[n:needed] = timestamps
+        self._n = needed
+
+        # Keep the buffer ordered if tokens were recorded in between
+        if n and buf[n - 1] > buf[n]:
+            buf[:needed].sort()
 
     def end(self, success: bool = True, error: Optional[str] = None):
         """Mark the end of the request."""
-        self.metrics.request_end = time.time()
+        self.metrics.request_end = time.perf_counter_ns()
         self.metrics.success = success
         self.metrics.error = error
 
-        if self.metrics.token_events:
-            self.metrics.token_events[-1].is_last = True
+        n = self._n
+        self.metrics.output_tokens = n
+        if n:
+            timestamps = self._timestamps[:n]
+            self.metrics.token_timestamps = timestamps
+            self.metrics.first_token_time = int(timestamps[0])
+            self.metrics.last_token_time = int(timestamps[-1])
 
         self.metrics.compute_metrics()
         return self.metrics
@@ -17,6 +17,14 @@ from dataclasses import dataclass
 
 from core.metrics import MetricsCollector, RequestMetrics, BenchmarkResult
 
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _dumps = json.dumps
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +44,10 @@ class PersonaPlexConfig:
     connect_timeout: float = 10.0
     response_timeout: float = 30.0
 
+    # Decode binary text tokens to str. When False, tokens are counted from
+    # the raw payload and only decoded if an on_token callback is given.
+    decode_tokens: bool = True
+
     # WebSocket endpoint path
     ws_path: str = "/api/chat"
 
@@ -57,6 +69,8 @@ class PersonaPlexBenchmarkClient:
         self.config = config
         self.ws = None
         self._connected = False
+        # Encoded config messages keyed by (text_prompt, voice_id)
+        self._config_blobs = {}
 
     async def connect(self) -> bool:
         """Establish WebSocket connection to PersonaPlex."""
@@ -71,11 +85,16 @@ class PersonaPlexBenchmarkClient:
                     ssl_context.verify_mode = ssl.CERT_NONE
 
             self.ws = await asyncio.wait_for(
+                # No permessage-deflate and no frame size cap: measured
+                # latency covers the network path only, without client-side
+                # zlib work or size checks on large audio frames
                 websockets.connect(
                     self.config.ws_url,
                     ssl=ssl_context,
                     ping_interval=20,
-                    ping_timeout=30
+                    ping_timeout=30,
+                    compression=None,
+                    max_size=None
                 ),
                 timeout=self.config.connect_timeout
             )
@@ -102,13 +121,17 @@ class PersonaPlexBenchmarkClient:
         if not self._connected or not self.ws:
             raise RuntimeError("Not connected to PersonaPlex")
 
-        config_message = {
-            "type": "config",
-            "text_prompt": text_prompt,
-            "voice_id": voice_id or self.config.voice_id
-        }
+        voice_id = voice_id or self.config.voice_id
+        key = (text_prompt, voice_id)
+        config_blob = self._config_blobs.get(key)
+        if config_blob is None:
+            config_blob = self._config_blobs[key] = _dumps({
+                "type": "config",
+                "text_prompt": text_prompt,
+                "voice_id": voice_id
+            })
 
-        await self.ws.send(json.dumps(config_message))
+        await self.ws.send(config_blob)
 
     async def benchmark_text_response(
         self,
@@ -124,7 +147,8 @@ class PersonaPlexBenchmarkClient:
             request_id: Unique identifier for this request
             text_prompt: System prompt for the model
             user_input: User message to process
-            on_token: Optional callback for each token received
+            on_token: Optional callback for each token received. It runs in
+                a separate task so a slow callback does not delay receives.
 
         Returns:
             RequestMetrics with timing data
@@ -138,6 +162,12 @@ class PersonaPlexBenchmarkClient:
             prompt_tokens=prompt_tokens
         )
 
+        token_queue = None
+        drain_task = None
+        if on_token:
+            token_queue = asyncio.Queue()
+            drain_task = asyncio.create_task(self._drain_tokens(token_queue, on_token))
+
         try:
             # Send configuration
             await self.send_config(text_prompt)
@@ -151,22 +181,32 @@ class PersonaPlexBenchmarkClient:
                 "type": "text_input",
                 "text": user_input
             }
-            await self.ws.send(json.dumps(input_message))
+            await self.ws.send(_dumps(input_message))
 
             # Receive response tokens
             response_text = ""
+            decode_tokens = self.config.decode_tokens
+            perf_counter_ns = time.perf_counter_ns
+            timeout_ns = self.config.response_timeout * 1e9
             async for message in self.ws:
                 if isinstance(message, bytes) and len(message) > 0:
                     kind = message[0]
                     payload = message[1:]
 
-                    if kind == 2:  # Text token
+                    if kind == 2 and not decode_tokens:  # Text token, undecoded
+                        # Same whitespace-only filter as the decoded path, on the bytes
+                        if payload.strip():
+                            collector.record_token()
+                            if token_queue:
+                                token_queue.put_nowait(payload.decode('utf-8', errors='ignore'))
+
+                    elif kind == 2:  # Text token
                         token_text = payload.decode('utf-8', errors='ignore')
                         if token_text.strip():
                             collector.record_token(token_text)
                             response_text += token_text
-                            if on_token:
-                                on_token(token_text)
+                            if token_queue:
+                                token_queue.put_nowait(token_text)
 
                 elif isinstance(message, str):
                     try:
@@ -178,8 +218,8 @@ class PersonaPlexBenchmarkClient:
                             if token_text:
                                 collector.record_token(token_text)
                                 response_text += token_text
-                                if on_token:
-                                    on_token(token_text)
+                                if token_queue:
+                                    token_queue.put_nowait(token_text)
 
                         elif msg_type == "end" or msg_type == "complete":
                             break
@@ -191,7 +231,7 @@ class PersonaPlexBenchmarkClient:
                         pass
 
                 # Check for timeout
-                if time.time() - collector.metrics.request_start > self.config.response_timeout:
+                if perf_counter_ns() - collector.metrics.request_start > timeout_ns:
                     raise TimeoutError("Response timeout exceeded")
 
             return collector.end(success=True)
@@ -200,6 +240,23 @@ class PersonaPlexBenchmarkClient:
             logger.error(f"Benchmark request failed: {e}")
             return collector.end(success=False, error=str(e))
 
+        finally:
+            if drain_task:
+                token_queue.put_nowait(None)
+                await drain_task
+
+    @staticmethod
+    async def _drain_tokens(queue: asyncio.Queue, on_token: Callable[[str], None]):
+        """Deliver queued tokens to the callback until a None sentinel arrives."""
+        while True:
+            token_text = await queue.get()
+            if token_text is None:
+                return
+            try:
+                on_token(token_text)
+            except Exception as e:
+                logger.error(f"on_token callback failed: {e}")
+
     async def benchmark_audio_latency(
         self,
         request_id: str,
@@ -234,15 +291,17 @@ class PersonaPlexBenchmarkClient:
             # Send audio data
             # PersonaPlex expects Opus-encoded audio with \x01 prefix
             # For benchmarking, we send raw audio and measure response time
-            user_stop_time = time.time()
+            user_stop_time = time.perf_counter_ns()
             await self.ws.send(audio_data)
 
             # Wait for first audio response
             agent_start_time = None
             token_count = 0
+            perf_counter_ns = time.perf_counter_ns
+            deadline = collector.metrics.request_start + int(self.config.response_timeout * 1e9)
 
             async for message in self.ws:
-                now = time.time()
+                now = perf_counter_ns()
 
                 if isinstance(message, bytes) and len(message) > 0:
                     kind = message[0]
@@ -250,7 +309,7 @@ class PersonaPlexBenchmarkClient:
                     if kind == 1:  # Audio response
                         if agent_start_time is None:
                             agent_start_time = now
-                            collector.record_turn_taking(user_stop_time, agent_start_time)
+                            collector.record_turn_taking(user_stop_time / 1e9, agent_start_time / 1e9)
                         token_count += 1
                         collector.record_token(f"[audio_chunk_{token_count}]")
 
@@ -260,7 +319,7 @@ class PersonaPlexBenchmarkClient:
                             collector.record_token(token_text)
 
                 # Timeout check
-                if now - collector.metrics.request_start > self.config.response_timeout:
+                if now > deadline:
                     break
 
             return collector.end(success=True)
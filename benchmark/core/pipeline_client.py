@@ -5,14 +5,28 @@ Connects to the FastAPI backend which proxies to PersonaPlex.
 Tests the complete audio pipeline: Client → Backend → PersonaPlex → Backend → Client
 """
 import asyncio
+import functools
+import importlib.util
 import json
 import time
 import logging
-from typing import Optional, Callable, List
+from typing import Optional, Callable, List, Dict
 from dataclasses import dataclass
 import httpx
+import numpy as np
+import websockets
 
-from core.metrics import MetricsCollector, RequestMetrics, BenchmarkResult, audio_to_tokens, bytes_to_audio_duration
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# httpx speaks HTTP/2 only when the optional h2 package is installed
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+from core.metrics import MetricsCollector, RequestMetrics, BenchmarkResult, audio_to_tokens, bytes_to_audio_duration_default
+from core._audio_kernels import first_voiced
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +46,24 @@ class PipelineConfig:
     connect_timeout: float = 10.0
     response_timeout: float = 60.0  # Allow more time for PersonaPlex processing
 
+    # Audio upload: bytes per websocket frame (default merges 8 frontend-sized
+    # 8192-byte chunks), and whether to pace frames at real-time playback rate
+    # like a live microphone (sleeps only while ahead of real time)
+    send_chunk_size: int = 65536
+    pace_sends: bool = False
+
+    # WebSocket transport: no permessage-deflate by default so latency is not
+    # skewed by zlib work (set to "deflate" if the backend requires it)
+    ws_compression: Optional[str] = None
+    ws_max_size: Optional[int] = 2 ** 24
+    ws_write_limit: int = 2 ** 20
+
+    # Treat the response as complete this many seconds after the user audio
+    # ends, once more than 10 audio chunks or text tokens have arrived. The
+    # backend streams continuously and never sends "end"/"complete", so this
+    # defaults on; None waits for an explicit end message (or the timeout).
+    assume_end_after_silence_sec: Optional[float] = 3.0
+
     @property
     def base_url(self) -> str:
         protocol = "https" if self.use_ssl else "http"
@@ -43,6 +75,40 @@ class PipelineConfig:
         return f"{protocol}://{self.backend_host}:{self.backend_port}"
 
 
+# Shared HTTP clients keyed by backend base URL, so session create/delete
+# and health checks reuse pooled keep-alive connections
+_http_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_http(config: PipelineConfig) -> httpx.AsyncClient:
+    """Get the shared HTTP client for a backend, creating it on first use."""
+    client = _http_clients.get(config.base_url)
+    if client is None or client.is_closed:
+        client = _http_clients[config.base_url] = httpx.AsyncClient(
+            base_url=config.base_url,
+            timeout=config.connect_timeout,
+            limits=httpx.Limits(max_keepalive_connections=64, keepalive_expiry=60),
+            http2=_HTTP2,
+        )
+    return client
+
+
+async def close_http():
+    """Close the shared HTTP clients. Call once before the event loop exits."""
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+@functools.lru_cache(maxsize=256)
+def _audio_prompt(audio_len: int):
+    """Prompt label and input token estimate for a PCM clip of the given size."""
+    # Moshi uses a 12.5 Hz semantic tokenizer
+    audio_duration = bytes_to_audio_duration_default(audio_len)
+    return f"[audio {audio_duration:.1f}s]", audio_to_tokens(audio_duration)
+
+
 class PipelineBenchmarkClient:
     """
     Benchmark client for the full audio pipeline.
@@ -64,11 +130,8 @@ class PipelineBenchmarkClient:
     async def connect(self) -> bool:
         """Create session and establish WebSocket connection."""
         try:
-            # Create HTTP client
-            self._http_client = httpx.AsyncClient(
-                base_url=self.config.base_url,
-                timeout=self.config.connect_timeout
-            )
+            # Shared, pooled HTTP client
+            self._http_client = get_http(self.config)
 
             # Create session
             response = await self._http_client.post(
@@ -85,8 +148,6 @@ class PipelineBenchmarkClient:
             logger.info(f"Created session: {self.session_id}")
 
             # Connect to WebSocket
-            import websockets
-
             ws_url = f"{self.config.ws_url}/ws/sessions/{self.session_id}/audio"
             logger.info(f"Connecting to WebSocket: {ws_url}")
 
@@ -94,7 +155,10 @@ class PipelineBenchmarkClient:
                 websockets.connect(
                     ws_url,
                     ping_interval=20,
-                    ping_timeout=30
+                    ping_timeout=30,
+                    compression=self.config.ws_compression,
+                    max_size=self.config.ws_max_size,
+                    write_limit=self.config.ws_write_limit
                 ),
                 timeout=self.config.connect_timeout
             )
@@ -124,25 +188,65 @@ class PipelineBenchmarkClient:
             except:
                 pass
 
-        if self._http_client:
-            await self._http_client.aclose()
-
         if self.session_id:
+            # Reuse the client (and pooled connection) the session was created on
+            client = self._http_client or get_http(self.config)
             try:
-                async with httpx.AsyncClient(base_url=self.config.base_url) as client:
-                    await client.delete(f"/sessions/{self.session_id}")
-            except:
-                pass
+                await client.delete(f"/sessions/{self.session_id}")
+            except Exception:
+                logger.debug("Session delete failed", exc_info=True)
+
+        # The HTTP client is shared; close_http() closes it at shutdown
+        self._http_client = None
 
         self._connected = False
         self.session_id = None
 
+    @classmethod
+    def prepare_audio(cls, audio_data: bytes) -> memoryview:
+        """
+        Trim a clip to the region that is sent to the pipeline.
+
+        Skips initial silence (keeping 0.5s before the first speech) and
+        caps the result at 10 seconds. Call once per clip, outside the timed
+        region, and pass the result to benchmark_audio_response() with
+        prepared=True.
+
+        Args:
+            audio_data: PCM audio bytes (24kHz, 16-bit, mono)
+
+        Returns:
+            memoryview over the selected region of audio_data
+        """
+        # Find where speech starts (skip initial silence)
+        samples = np.frombuffer(audio_data, dtype=np.int16)
+        threshold = 500  # Amplitude threshold for speech detection
+        first_speech = first_voiced(samples, threshold)
+
+        if first_speech >= 0:
+            # Start 0.5 seconds before first speech
+            start_sample = max(0, first_speech - 12000)  # 0.5s buffer
+            start_byte = start_sample * 2  # 16-bit = 2 bytes per sample
+        else:
+            start_byte = 0
+
+        # Send 10 seconds of audio starting from speech (more context)
+        audio_duration_sec = 10
+        max_audio_bytes = 24000 * 2 * audio_duration_sec
+        end_byte = min(start_byte + max_audio_bytes, len(audio_data))
+
+        logger.info(f"Sending audio from {start_byte/(24000*2):.1f}s to {end_byte/(24000*2):.1f}s ({(end_byte - start_byte)/(24000*2):.1f}s)")
+
+        # memoryview slices share audio_data's buffer instead of copying
+        return memoryview(audio_data)[start_byte:end_byte]
+
     async def benchmark_audio_response(
         self,
         request_id: str,
         audio_data: bytes,
         on_audio: Optional[Callable[[bytes], None]] = None,
-        on_text: Optional[Callable[[str], None]] = None
+        on_text: Optional[Callable[[str], None]] = None,
+        prepared: bool = False
     ) -> RequestMetrics:
         """
         Benchmark a single audio request through the full pipeline.
@@ -152,6 +256,7 @@ class PipelineBenchmarkClient:
             audio_data: PCM audio bytes (24kHz, 16-bit, mono)
             on_audio: Callback for each audio chunk received
             on_text: Callback for each text token received
+            prepared: audio_data was already trimmed with prepare_audio()
 
         Returns:
             RequestMetrics with timing data
@@ -159,149 +264,188 @@ class PipelineBenchmarkClient:
         if not self._connected or not self.ws:
             raise RuntimeError("Not connected to pipeline")
 
-        # Calculate input tokens from audio duration (Moshi uses 12.5 Hz semantic tokenizer)
-        audio_duration = bytes_to_audio_duration(len(audio_data))
-        prompt_tokens = audio_to_tokens(audio_duration)
+        # Silence trimming happens before the timed region
+        audio_to_send = memoryview(audio_data) if prepared else self.prepare_audio(audio_data)
+
+        # Calculate input tokens from the duration actually sent (cached per
+        # length), so prepared and unprepared calls report the same figures
+        prompt, prompt_tokens = _audio_prompt(len(audio_to_send))
 
         collector = MetricsCollector(
             request_id=request_id,
-            prompt=f"[audio {audio_duration:.1f}s]",
+            prompt=prompt,
             prompt_tokens=prompt_tokens
         )
+        # Audio chunk arrival times, handed to the collector in one batch
+        audio_ts: List[int] = []
 
         try:
             # Start timing
             collector.start()
-            send_time = time.time()
-
-            # Send audio data in chunks (matching frontend's ScriptProcessor)
-            # Frontend uses 4096 samples per chunk = 8192 bytes (24kHz, 16-bit mono)
-            chunk_size = 8192  # 4096 samples * 2 bytes = 8192 bytes
-            chunk_interval = 0.01  # Small delay to not overwhelm the connection
-
-            # Find where speech starts (skip initial silence)
-            import numpy as np
-            samples = np.frombuffer(audio_data, dtype=np.int16)
-            threshold = 500  # Amplitude threshold for speech detection
-            non_silent = np.where(np.abs(samples) > threshold)[0]
-
-            if len(non_silent) > 0:
-                # Start 0.5 seconds before first speech
-                start_sample = max(0, non_silent[0] - 12000)  # 0.5s buffer
-                start_byte = start_sample * 2  # 16-bit = 2 bytes per sample
-            else:
-                start_byte = 0
-
-            # Send 10 seconds of audio starting from speech (more context)
-            audio_duration_sec = 10
-            max_audio_bytes = 24000 * 2 * audio_duration_sec
-            end_byte = min(start_byte + max_audio_bytes, len(audio_data))
-            audio_to_send = audio_data[start_byte:end_byte]
-
-            logger.info(f"Sending audio from {start_byte/(24000*2):.1f}s to {end_byte/(24000*2):.1f}s ({len(audio_to_send)/(24000*2):.1f}s)")
-            logger.info(f"Total chunks to send: {len(audio_to_send) // chunk_size}")
-
-            chunks_sent = 0
-            for i in range(0, len(audio_to_send), chunk_size):
-                chunk = audio_to_send[i:i + chunk_size]
-                await self.ws.send(chunk)
-                chunks_sent += 1
-                if chunks_sent % 10 == 0:
-                    logger.debug(f"Sent {chunks_sent} chunks ({chunks_sent * chunk_size / (24000*2):.1f}s)")
-                await asyncio.sleep(chunk_interval)  # Small pacing delay
-
-            logger.info(f"Finished sending {chunks_sent} chunks")
-
-            # Record when we finished sending
-            user_stop_time = time.time()
-
-            # Receive response
+            send_time = time.perf_counter_ns()
+
+            # Receive response. The server streams its reply while the
+            # upload is still in flight, so sending and receiving overlap.
+            send_done = asyncio.Event()
+            user_stop_time = None
             agent_start_time = None
-            response_text = ""
+            text_parts: List[str] = []
             audio_chunks = 0
             text_tokens = 0
 
             async def receive_with_timeout():
-                nonlocal agent_start_time, response_text, audio_chunks, text_tokens
-
-                while True:
-                    try:
-                        message = await asyncio.wait_for(
-                            self.ws.recv(),
-                            timeout=self.config.response_timeout
-                        )
-
-                        now = time.time()
-
-                        if isinstance(message, bytes):
-                            # Audio response
-                            logger.debug(f"Received audio chunk: {len(message)} bytes")
-                            if agent_start_time is None:
-                                agent_start_time = now
-                                collector.record_turn_taking(user_stop_time, agent_start_time)
-                                logger.info(f"First audio response at {(now - send_time)*1000:.1f}ms")
-
-                            audio_chunks += 1
-                            collector.record_token(f"[audio_chunk_{audio_chunks}]")
-
-                            if on_audio:
-                                on_audio(message)
-
-                        elif isinstance(message, str):
-                            # JSON message
-                            logger.debug(f"Received JSON: {message[:200]}")
-                            try:
-                                data = json.loads(message)
-                                msg_type = data.get("type")
-
-                                if msg_type == "transcript":
-                                    # Agent transcript
-                                    text = data.get("text", "")
-                                    speaker = data.get("speaker", "unknown")
-                                    logger.info(f"Transcript [{speaker}]: {text[:100]}")
-                                    if text and speaker == "agent":
-                                        if agent_start_time is None:
-                                            agent_start_time = now
-                                            collector.record_turn_taking(user_stop_time, agent_start_time)
-
-                                        text_tokens += 1
-                                        collector.record_token(text)
-                                        response_text += text
-
-                                        if on_text:
-                                            on_text(text)
-
-                                elif msg_type == "end" or msg_type == "complete":
-                                    logger.info("Received end/complete message")
-                                    return True
-
-                                elif msg_type == "error":
-                                    logger.error(f"Error from server: {data.get('message')}")
-                                    raise RuntimeError(data.get("message", "Unknown error"))
-
-                                elif msg_type == "info":
-                                    logger.info(f"Info: {data.get('message')}")
-
-                            except json.JSONDecodeError:
-                                pass
-
-                        # Check if we've received enough response
-                        elapsed = now - send_time
-                        if elapsed > 3.0 and (audio_chunks > 10 or text_tokens > 10):
-                            # Got substantial response, consider it done
-                            logger.info(f"Response complete: {audio_chunks} audio chunks, {text_tokens} text tokens")
-                            return True
-
-                    except asyncio.TimeoutError:
-                        logger.warning("Response timeout")
-                        return False
-
-            success = await receive_with_timeout()
-
+                nonlocal agent_start_time, audio_chunks, text_tokens
+
+                # Bind hot-loop lookups to locals once
+                response_timeout = self.config.response_timeout
+                assume_end = self.config.assume_end_after_silence_sec
+                assume_end_ns = assume_end * 1e9 if assume_end is not None else None
+                loop = asyncio.get_running_loop()
+                recv = self.ws.recv
+                loads = _loads
+                perf_ns = time.perf_counter_ns
+                add_audio_ts = audio_ts.append
+                record_token = collector.record_token
+                record_turn = collector.record_turn_taking
+                send_finished = send_done.is_set
+
+                try:
+                    # One timeout for the whole loop, pushed back after each
+                    # message so that no single gap exceeds response_timeout
+                    async with asyncio.timeout(response_timeout) as deadline:
+                        while True:
+                            message = await recv()
+                            if response_timeout:
+                                deadline.reschedule(loop.time() + response_timeout)
+
+                            # One monotonic read per message, on the collector's clock
+                            now = perf_ns()
+
+                            if isinstance(message, bytes):
+                                # Audio response
+                                logger.debug("Received audio chunk: %d bytes", len(message))
+                                # Turn-taking counts from the end of the user's turn
+                                if agent_start_time is None and send_finished():
+                                    agent_start_time = now
+                                    record_turn(user_stop_time / 1e9, agent_start_time / 1e9)
+                                    logger.info("First audio response at %.1fms", (now - send_time) / 1e6)
+
+                                audio_chunks += 1
+                                add_audio_ts(now)
+
+                                if on_audio:
+                                    on_audio(message)
+
+                            elif isinstance(message, str) and message.startswith("{"):
+                                # JSON message (other text frames are not parsed)
+                                logger.debug("Received JSON: %.200s", message)
+                                try:
+                                    data = loads(message)
+                                    msg_type = data.get("type")
+
+                                    if msg_type == "transcript":
+                                        # Agent transcript
+                                        text = data.get("text", "")
+                                        speaker = data.get("speaker", "unknown")
+                                        logger.info("Transcript [%s]: %.100s", speaker, text)
+                                        if text and speaker == "agent":
+                                            if agent_start_time is None and send_finished():
+                                                agent_start_time = now
+                                                record_turn(user_stop_time / 1e9, agent_start_time / 1e9)
+
+                                            text_tokens += 1
+                                            record_token(text)
+                                            text_parts.append(text)
+
+                                            if on_text:
+                                                on_text(text)
+
+                                    elif msg_type == "end" or msg_type == "complete":
+                                        logger.info("Received end/complete message")
+                                        return True
+
+                                    elif msg_type == "error":
+                                        logger.error(f"Error from server: {data.get('message')}")
+                                        raise RuntimeError(data.get("message", "Unknown error"))
+
+                                    elif msg_type == "info":
+                                        logger.info("Info: %s", data.get("message"))
+
+                                except json.JSONDecodeError:
+                                    logger.debug("Ignoring undecodable message: %.200s", message)
+
+                            # Check if we've received enough response; only
+                            # meaningful once the whole request has been sent
+                            if (
+                                assume_end_ns is not None
+                                and send_finished()
+                                and now - user_stop_time > assume_end_ns
+                                and (audio_chunks > 10 or text_tokens > 10)
+                            ):
+                                # Got substantial response, consider it done
+                                logger.info(f"Response complete: {audio_chunks} audio chunks, {text_tokens} text tokens")
+                                return True
+
+                except TimeoutError:
+                    logger.warning("Response timeout")
+                    return False
+
+            async def send_all():
+                nonlocal user_stop_time
+
+                # Send audio data in merged frames. The frontend's ScriptProcessor
+                # uses 4096 samples per chunk = 8192 bytes (24kHz, 16-bit mono)
+                chunk_size = self.config.send_chunk_size
+                pace_sends = self.config.pace_sends
+                bytes_per_sec = 24000 * 2
+
+                logger.info(f"Total chunks to send: {len(audio_to_send) // chunk_size}")
+
+                frames = [audio_to_send[i:i + chunk_size] for i in range(0, len(audio_to_send), chunk_size)]
+
+                if pace_sends:
+                    chunks_sent = 0
+                    next_send_time = time.monotonic()
+                    for chunk in frames:
+                        await self.ws.send(chunk)
+                        chunks_sent += 1
+                        if chunks_sent % 10 == 0 and logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Sent %d chunks (%.1fs)", chunks_sent, chunks_sent * chunk_size / (24000*2))
+                        # Token bucket: only sleep while ahead of real-time playback
+                        next_send_time += len(chunk) / bytes_per_sec
+                        delay = next_send_time - time.monotonic()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                else:
+                    # websockets writes frames in call order, so the sends can be
+                    # dispatched together instead of awaiting each one in turn
+                    await asyncio.gather(*(self.ws.send(chunk) for chunk in frames))
+                    chunks_sent = len(frames)
+
+                logger.info(f"Finished sending {chunks_sent} chunks")
+
+                # Record when we finished sending
+                user_stop_time = time.perf_counter_ns()
+                send_done.set()
+
+            receive_task = asyncio.create_task(receive_with_timeout())
+            try:
+                await send_all()
+            except BaseException:
+                receive_task.cancel()
+                # Let the receiver unwind before the send error propagates
+                await asyncio.gather(receive_task, return_exceptions=True)
+                raise
+            success = await receive_task
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response text: %.200s", "".join(text_parts))
+
+            collector.record_audio_chunks(audio_ts)
             return collector.end(success=success)
 
         except Exception as e:
             logger.error(f"Pipeline benchmark failed: {e}")
+            collector.record_audio_chunks(audio_ts)
             return collector.end(success=False, error=str(e))
 
     async def get_session_info(self) -> dict:
@@ -319,13 +463,13 @@ class PipelineBenchmarkClient:
         return {}
 
 
-async def check_backend_health(config: PipelineConfig) -> dict:
+async def check_backend_health(config: PipelineConfig, client: Optional[httpx.AsyncClient] = None) -> dict:
     """Check if the backend is healthy and PersonaPlex is connected."""
     try:
-        async with httpx.AsyncClient(base_url=config.base_url, timeout=5.0) as client:
-            response = await client.get("/health")
-            if response.status_code == 200:
-                return response.json()
+        client = client or get_http(config)
+        response = await client.get("/health", timeout=5.0)
+        if response.status_code == 200:
+            return response.json()
     except Exception as e:
         return {"error": str(e)}
 
@@ -2,20 +2,108 @@
 System metrics collection for PersonaPlex benchmarks.
 
 Collects GPU, CPU, and memory metrics during benchmark runs.
+
+GPU samples are read in-process through NVML (pynvml / nvidia-ml-py) when it
+is installed, falling back to polling nvidia-smi otherwise.
+
+ProcessMetricsCollector runs the same collector in a child process, so
+sampling never competes with the benchmark's event loop for the GIL.
 """
+import atexit
+import functools
+import multiprocessing
 import subprocess
 import json
+import os
+import re
 import time
 import threading
 import logging
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+from datetime import datetime, timezone
+
+import numpy as np
+
+try:
+    import pynvml
+except ImportError:
+    pynvml = None
 
 logger = logging.getLogger(__name__)
 
+# Per-GPU fields kept for each sample, as the last axis of the sample buffer
+_GPU_FIELDS = ("utilization_gpu_percent", "memory_used_mb", "memory_percent", "temperature_c", "power_draw_w")
+_F_UTIL, _F_MEM_USED, _F_MEM_PCT, _F_TEMP, _F_POWER = range(len(_GPU_FIELDS))
+
+# Number of most recent GPU samples kept in the history ring buffer
+_GPU_HISTORY_CAPACITY = 4096
+
+# Splits an nvidia-smi CSV row (already stripped) into fields
+_CSV_SPLIT_RE = re.compile(r'\s*,\s*')
+
+# nvidia-smi query for per-sample GPU metrics, parsed by _parse_gpu_metrics
+_SMI_METRICS_QUERY = (
+    "--query-gpu=index,memory.used,memory.free,memory.total,"
+    "utilization.gpu,utilization.memory,temperature.gpu,"
+    "power.draw,power.limit"
+)
+
+# GPU sampling backs off exponentially after a failed sample, up to this
+# delay, and is disabled for the run after this many consecutive failures
+_GPU_MAX_BACKOFF_SEC = 30.0
+_GPU_MAX_CONSECUTIVE_ERRORS = 10
+
+# How long to watch NVML power readings when measuring their update period
+_POWER_PROBE_SEC = 0.2
+
+# How long ProcessMetricsCollector waits for its child to start sampling,
+# and to hand back the summary once asked to stop
+_PROCESS_START_TIMEOUT_SEC = 30.0
+_PROCESS_STOP_TIMEOUT_SEC = 5.0
+
+_nvml_ready: Optional[bool] = None
+
+
+def _power_field_ids() -> Optional[List[int]]:
+    """NVML field IDs for (power draw, power limit), if this pynvml has them."""
+    draw = getattr(pynvml, "NVML_FI_DEV_POWER_INSTANT", None)
+    limit = getattr(pynvml, "NVML_FI_DEV_POWER_CURRENT_LIMIT", None)
+    if draw is None or limit is None or not hasattr(pynvml, "nvmlDeviceGetFieldValues"):
+        return None
+    return [draw, limit]
+
+
+def _field_value(fv) -> float:
+    """Extract the numeric value of an nvmlFieldValue_t."""
+    value_type = fv.valueType
+    if value_type == pynvml.NVML_VALUE_TYPE_DOUBLE:
+        return fv.value.dVal
+    if value_type == pynvml.NVML_VALUE_TYPE_UNSIGNED_INT:
+        return fv.value.uiVal
+    if value_type == pynvml.NVML_VALUE_TYPE_UNSIGNED_LONG:
+        return fv.value.ulVal
+    if value_type == pynvml.NVML_VALUE_TYPE_SIGNED_LONG_LONG:
+        return fv.value.sllVal
+    return fv.value.ullVal
+
+
+def _nvml_init() -> bool:
+    """Initialize NVML once per process. Returns True if it is usable."""
+    global _nvml_ready
+    if _nvml_ready is None:
+        _nvml_ready = False
+        if pynvml is not None:
+            try:
+                pynvml.nvmlInit()
+                atexit.register(pynvml.nvmlShutdown)
+                _nvml_ready = True
+            except pynvml.NVMLError as e:
+                logger.debug(f"NVML unavailable, using nvidia-smi: {e}")
+    return _nvml_ready
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class GPUInfo:
     """Static GPU information."""
     index: int
@@ -26,7 +114,7 @@ class GPUInfo:
     compute_capability: str = ""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GPUMetrics:
     """Dynamic GPU metrics at a point in time."""
     timestamp: float
@@ -41,7 +129,7 @@ class GPUMetrics:
     power_limit_w: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SystemMetrics:
     """System-wide metrics."""
     timestamp: float
@@ -69,6 +157,15 @@ class MetricsSummary:
     gpu_power_draw_mean_w: List[float] = field(default_factory=list)
     gpu_power_draw_max_w: List[float] = field(default_factory=list)
 
+    # GPU tail percentiles (per GPU), over the most recent
+    # _GPU_HISTORY_CAPACITY samples
+    gpu_utilization_p50: List[float] = field(default_factory=list)
+    gpu_utilization_p95: List[float] = field(default_factory=list)
+    gpu_utilization_p99: List[float] = field(default_factory=list)
+    gpu_power_draw_p50_w: List[float] = field(default_factory=list)
+    gpu_power_draw_p95_w: List[float] = field(default_factory=list)
+    gpu_power_draw_p99_w: List[float] = field(default_factory=list)
+
     # System metrics summary
     cpu_percent_mean: float = 0.0
     cpu_percent_max: float = 0.0
@@ -98,41 +195,230 @@ class MetricsSummary:
 
                 if i < len(self.gpu_utilization_mean):
                     gpu_data["utilization"] = {
-                        "mean_percent": round(self.gpu_utilization_mean[i], 1),
-                        "max_percent": round(self.gpu_utilization_max[i], 1),
+                        "mean_percent": self.gpu_utilization_mean[i],
+                        "max_percent": self.gpu_utilization_max[i],
                     }
+                    if i < len(self.gpu_utilization_p50):
+                        gpu_data["utilization"].update({
+                            "p50_percent": self.gpu_utilization_p50[i],
+                            "p95_percent": self.gpu_utilization_p95[i],
+                            "p99_percent": self.gpu_utilization_p99[i],
+                        })
                     gpu_data["memory"] = {
                         "total_mb": gpu.memory_total_mb,
-                        "used_mean_mb": round(self.gpu_memory_used_mean_mb[i], 1),
-                        "used_max_mb": round(self.gpu_memory_used_max_mb[i], 1),
-                        "percent_mean": round(self.gpu_memory_percent_mean[i], 1),
+                        "used_mean_mb": self.gpu_memory_used_mean_mb[i],
+                        "used_max_mb": self.gpu_memory_used_max_mb[i],
+                        "percent_mean": self.gpu_memory_percent_mean[i],
                     }
                     gpu_data["temperature"] = {
-                        "mean_c": round(self.gpu_temperature_mean_c[i], 1),
+                        "mean_c": self.gpu_temperature_mean_c[i],
                         "max_c": self.gpu_temperature_max_c[i],
                     }
                     gpu_data["power"] = {
-                        "draw_mean_w": round(self.gpu_power_draw_mean_w[i], 1),
-                        "draw_max_w": round(self.gpu_power_draw_max_w[i], 1),
+                        "draw_mean_w": self.gpu_power_draw_mean_w[i],
+                        "draw_max_w": self.gpu_power_draw_max_w[i],
                     }
+                    if i < len(self.gpu_power_draw_p50_w):
+                        gpu_data["power"].update({
+                            "draw_p50_w": self.gpu_power_draw_p50_w[i],
+                            "draw_p95_w": self.gpu_power_draw_p95_w[i],
+                            "draw_p99_w": self.gpu_power_draw_p99_w[i],
+                        })
 
                 result["gpus"].append(gpu_data)
 
         result["system"] = {
-            "cpu_percent_mean": round(self.cpu_percent_mean, 1),
-            "cpu_percent_max": round(self.cpu_percent_max, 1),
-            "memory_used_mean_mb": round(self.memory_used_mean_mb, 1),
+            "cpu_percent_mean": self.cpu_percent_mean,
+            "cpu_percent_max": self.cpu_percent_max,
+            "memory_used_mean_mb": self.memory_used_mean_mb,
             "memory_used_max_mb": self.memory_used_max_mb,
         }
 
         return result
 
 
+def _safe_int(val, default=0):
+    """Parse an nvidia-smi integer field, handling [N/A] values."""
+    try:
+        if val and val != '[N/A]' and val != 'N/A':
+            return int(float(val))
+        return default
+    except (ValueError, TypeError):
+        return default
+
+
+def _safe_float(val, default=0.0):
+    """Parse an nvidia-smi float field, handling [N/A] values."""
+    try:
+        if val and val != '[N/A]' and val != 'N/A':
+            return float(val)
+        return default
+    except ValueError:
+        return default
+
+
+_proc_fds: Dict[str, int] = {}
+
+
+def _read_proc(path: str, size: int) -> bytes:
+    """
+    Read the first bytes of a /proc file.
+
+    The file descriptor is opened once and kept for the life of the process;
+    pread at offset 0 makes the kernel regenerate the contents on each call.
+    """
+    fd = _proc_fds.get(path)
+    if fd is None:
+        fd = _proc_fds[path] = os.open(path, os.O_RDONLY)
+    return os.pread(fd, size, 0)
+
+
+def _meminfo_kb(buf: bytes, key: bytes) -> int:
+    """Extract a field such as b'MemAvailable:' from /proc/meminfo, in kB."""
+    start = buf.find(key)
+    if start < 0:
+        return 0
+    end = buf.find(b'\n', start)
+    return int(buf[start + len(key):end].split()[0])
+
+
+def _read_cpu_times() -> Optional[Tuple[int, int]]:
+    """
+    Read aggregate CPU jiffies from the first line of /proc/stat.
+
+    Returns:
+        (busy, total) jiffies, or None if /proc/stat is unavailable
+    """
+    try:
+        buf = _read_proc('/proc/stat', 512)
+    except OSError:
+        return None
+
+    # cpu user nice system idle iowait irq softirq steal ...
+    fields = buf[:buf.find(b'\n')].split()
+    if len(fields) < 9 or fields[0] != b'cpu':
+        return None
+    total = sum(int(v) for v in fields[1:9])
+    idle = int(fields[4]) + int(fields[5])
+    return total - idle, total
+
+
+def _parse_gpu_metrics(lines: Iterable[str], timestamp: float) -> List[GPUMetrics]:
+    """Parse nvidia-smi CSV rows for _SMI_METRICS_QUERY into GPUMetrics."""
+    metrics = []
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        parts = _CSV_SPLIT_RE.split(line)
+        if len(parts) >= 9:
+            metrics.append(GPUMetrics(
+                timestamp=timestamp,
+                index=_safe_int(parts[0]),
+                memory_used_mb=_safe_int(parts[1]),
+                memory_free_mb=_safe_int(parts[2]),
+                memory_total_mb=_safe_int(parts[3]),
+                utilization_gpu_percent=_safe_float(parts[4]),
+                utilization_memory_percent=_safe_float(parts[5]),
+                temperature_c=_safe_int(parts[6]),
+                power_draw_w=_safe_float(parts[7]),
+                power_limit_w=_safe_float(parts[8])
+            ))
+
+    return metrics
+
+
+def _query_cuda_version() -> str:
+    """Get the CUDA driver version from NVML, or the nvidia-smi banner."""
+    if _nvml_init():
+        try:
+            version = pynvml.nvmlSystemGetCudaDriverVersion()
+            return f"{version // 1000}.{(version % 1000) // 10}"
+        except pynvml.NVMLError as e:
+            logger.debug(f"Failed to get CUDA version from NVML: {e}")
+
+    smi_output = subprocess.run(
+        ["nvidia-smi"],
+        capture_output=True,
+        text=True,
+        timeout=5
+    )
+    if smi_output.returncode != 0:
+        return ""
+    for line in smi_output.stdout.split('\n'):
+        if 'CUDA Version' in line:
+            parts = line.split('CUDA Version:')
+            if len(parts) > 1:
+                return parts[1].strip().split()[0]
+            break
+    return ""
+
+
+@functools.lru_cache(maxsize=None)
+def _query_gpu_info() -> Tuple[GPUInfo, ...]:
+    """
+    Query static GPU information.
+
+    The result does not change while the process runs, so it is cached and
+    nvidia-smi is only invoked on the first call.
+    """
+    fields = "index,name,driver_version,memory.total,compute_cap"
+    try:
+        result = subprocess.run(
+            ["nvidia-smi", f"--query-gpu={fields}", "--format=csv,noheader,nounits"],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        if result.returncode != 0:
+            # compute_cap is not supported by older drivers
+            fields = "index,name,driver_version,memory.total"
+            result = subprocess.run(
+                ["nvidia-smi", f"--query-gpu={fields}", "--format=csv,noheader,nounits"],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+
+        if result.returncode != 0:
+            logger.warning("nvidia-smi failed, no GPU metrics available")
+            return ()
+
+        cuda_version = _query_cuda_version()
+
+        gpus = []
+        for line in result.stdout.strip().split('\n'):
+            if not line.strip():
+                continue
+            parts = _CSV_SPLIT_RE.split(line.strip())
+            if len(parts) >= 4:
+                compute_cap = parts[4] if len(parts) >= 5 and parts[4] != '[N/A]' else ""
+                gpus.append(GPUInfo(
+                    index=_safe_int(parts[0], 0),
+                    name=parts[1] if parts[1] != '[N/A]' else 'Unknown GPU',
+                    driver_version=parts[2] if parts[2] != '[N/A]' else 'N/A',
+                    cuda_version=cuda_version,
+                    memory_total_mb=_safe_int(parts[3], 0),
+                    compute_capability=compute_cap
+                ))
+
+        return tuple(gpus)
+
+    except FileNotFoundError:
+        logger.warning("nvidia-smi not found, no GPU metrics available")
+        return ()
+    except Exception as e:
+        logger.warning(f"Failed to get GPU info: {e}")
+        return ()
+
+
 class SystemMetricsCollector:
     """
     Collects system and GPU metrics during benchmark runs.
 
-    Uses nvidia-smi for GPU metrics and /proc for system metrics.
+    Uses NVML for GPU metrics (nvidia-smi if NVML is unavailable) and /proc
+    for system metrics.
     """
 
     def __init__(self, sample_interval: float = 1.0):
@@ -143,100 +429,156 @@ class SystemMetricsCollector:
             sample_interval: Seconds between metric samples
         """
         self.sample_interval = sample_interval
-        self._gpu_samples: List[List[GPUMetrics]] = []  # [sample_idx][gpu_idx]
-        self._system_samples: List[SystemMetrics] = []
+        # Samples are folded into running sums and maxima as they arrive, so
+        # the collector holds O(1) state however long the run is.
+        # GPU aggregates have shape (num_gpus, fields). The last
+        # _GPU_HISTORY_CAPACITY samples are also kept in a preallocated ring,
+        # written by the sampler thread at slot _n_gpu_samples % capacity.
+        self._gpu_ring = np.zeros((_GPU_HISTORY_CAPACITY, 0, len(_GPU_FIELDS)))
+        self._gpu_sum = np.zeros((0, len(_GPU_FIELDS)))
+        self._gpu_max = np.zeros((0, len(_GPU_FIELDS)))
+        self._n_gpu_samples = 0
+        self._cpu_sum = 0.0
+        self._cpu_max = 0.0
+        self._mem_sum = 0
+        self._mem_max = 0
+        self._n_system_samples = 0
+        self._mem_total_mb = 0
+        self._prev_cpu_times = _read_cpu_times() or (0, 0)
         self._collecting = False
         self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        # Looping nvidia-smi process and its reader, used when NVML is unavailable
+        self._smi_proc: Optional[subprocess.Popen] = None
+        self._smi_thread: Optional[threading.Thread] = None
+        # Guards the aggregates against a sampler that outlives stop()'s join
+        self._lock = threading.Lock()
         self._gpu_info: List[GPUInfo] = []
+        self._handles: list = []  # NVML device handles, parallel to _gpu_info
+        # Per-GPU NVML power update period (0 if unknown) and last reading
+        self._power_period_s: List[float] = []
+        self._power_last: List[Tuple[float, float, float]] = []  # (monotonic, draw W, limit W)
+        self._power_fields: Optional[List[int]] = None
 
     def get_gpu_info(self) -> List[GPUInfo]:
         """Get static GPU information."""
-        if self._gpu_info:
-            return self._gpu_info
-
+        if not self._gpu_info:
+            self._gpu_info = list(_query_gpu_info())
+            self._init_handles()
+        return self._gpu_info
+
+    def _init_handles(self):
+        """Cache NVML device handles for the detected GPUs."""
+        self._handles = []
+        if not _nvml_init():
+            return
         try:
-            result = subprocess.run(
-                [
-                    "nvidia-smi",
-                    "--query-gpu=index,name,driver_version,memory.total",
-                    "--format=csv,noheader,nounits"
-                ],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            self._handles = [pynvml.nvmlDeviceGetHandleByIndex(gpu.index) for gpu in self._gpu_info]
+        except pynvml.NVMLError as e:
+            logger.debug(f"Failed to get NVML device handles: {e}")
+            self._handles = []
 
-            if result.returncode != 0:
-                logger.warning("nvidia-smi failed, no GPU metrics available")
-                return []
+        self._power_period_s = [0.0] * len(self._handles)
+        self._power_last = [(float("-inf"), 0.0, 0.0)] * len(self._handles)
+        self._power_fields = _power_field_ids() if self._handles else None
 
-            # Get CUDA version
-            cuda_version = ""
-            cuda_result = subprocess.run(
-                ["nvidia-smi", "--query-gpu=driver_version", "--format=csv,noheader"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if cuda_result.returncode == 0:
-                # Parse CUDA version from nvidia-smi output
-                smi_output = subprocess.run(
-                    ["nvidia-smi"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                for line in smi_output.stdout.split('\n'):
-                    if 'CUDA Version' in line:
-                        parts = line.split('CUDA Version:')
-                        if len(parts) > 1:
-                            cuda_version = parts[1].strip().split()[0]
-                        break
-
-            gpus = []
-            for line in result.stdout.strip().split('\n'):
-                if not line.strip():
-                    continue
-                parts = [p.strip() for p in line.split(',')]
-                if len(parts) >= 4:
-                    # Handle [N/A] values
-                    def safe_int(val, default=0):
-                        try:
-                            if val and val != '[N/A]' and val != 'N/A':
-                                return int(float(val))
-                            return default
-                        except (ValueError, TypeError):
-                            return default
-
-                    gpus.append(GPUInfo(
-                        index=safe_int(parts[0], 0),
-                        name=parts[1] if parts[1] != '[N/A]' else 'Unknown GPU',
-                        driver_version=parts[2] if parts[2] != '[N/A]' else 'N/A',
-                        cuda_version=cuda_version,
-                        memory_total_mb=safe_int(parts[3], 0)
-                    ))
-
-            self._gpu_info = gpus
-            return gpus
-
-        except FileNotFoundError:
-            logger.warning("nvidia-smi not found, no GPU metrics available")
-            return []
-        except Exception as e:
-            logger.warning(f"Failed to get GPU info: {e}")
-            return []
+    def _probe_power_period(self):
+        """
+        Measure how often NVML refreshes each GPU's power reading.
+
+        The driver only updates power draw every ~20-100ms depending on the
+        GPU, so when sampling faster than that the reading can be reused.
+        Polls all GPUs for _POWER_PROBE_SEC and takes the median interval
+        between value changes; GPUs whose reading never changes get 0.
+        """
+        num_gpus = len(self._handles)
+        changes: List[List[float]] = [[] for _ in range(num_gpus)]
+        last = [None] * num_gpus
+
+        end = time.monotonic() + _POWER_PROBE_SEC
+        while time.monotonic() < end:
+            for i, handle in enumerate(self._handles):
+                value = pynvml.nvmlDeviceGetPowerUsage(handle)
+                if value != last[i]:
+                    if last[i] is not None:
+                        changes[i].append(time.monotonic())
+                    last[i] = value
+            time.sleep(0.001)
+
+        self._power_period_s = [
+            float(np.median(np.diff(t))) if len(t) >= 3 else 0.0
+            for t in changes
+        ]
+        logger.debug(f"NVML power update periods: {self._power_period_s}")
+
+    def _read_power(self, handle) -> Tuple[float, float]:
+        """
+        Read power draw and limit in watts.
+
+        Both come from a single nvmlDeviceGetFieldValues call when the
+        driver supports the power field IDs, otherwise from one call each.
+        """
+        if self._power_fields is not None:
+            draw, limit = pynvml.nvmlDeviceGetFieldValues(handle, self._power_fields)
+            if draw.nvmlReturn == pynvml.NVML_SUCCESS and limit.nvmlReturn == pynvml.NVML_SUCCESS:
+                return _field_value(draw) / 1000, _field_value(limit) / 1000
+            # Field not supported by this driver/GPU; stop asking for it
+            self._power_fields = None
+
+        return (
+            pynvml.nvmlDeviceGetPowerUsage(handle) / 1000,
+            pynvml.nvmlDeviceGetEnforcedPowerLimit(handle) / 1000,
+        )
 
     def _sample_gpu_metrics(self) -> List[GPUMetrics]:
         """Sample current GPU metrics."""
+        if self._handles:
+            try:
+                return self._sample_gpu_metrics_nvml()
+            except pynvml.NVMLError as e:
+                logger.debug(f"NVML sampling failed, falling back to nvidia-smi: {e}")
+                self._handles = []
+        return self._sample_gpu_metrics_smi()
+
+    def _sample_gpu_metrics_nvml(self) -> List[GPUMetrics]:
+        """Sample current GPU metrics through NVML."""
+        timestamp = time.time()
+        metrics = []
+
+        now = time.monotonic()
+        power_period = self._power_period_s
+        power_last = self._power_last
+
+        for i, (gpu, handle) in enumerate(zip(self._gpu_info, self._handles)):
+            memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            utilization = pynvml.nvmlDeviceGetUtilizationRates(handle)
+
+            # Reuse the last power reading until NVML would have refreshed it
+            queried_at, power_draw, power_limit = power_last[i]
+            if now - queried_at >= power_period[i]:
+                power_draw, power_limit = self._read_power(handle)
+                power_last[i] = (now, power_draw, power_limit)
+
+            metrics.append(GPUMetrics(
+                timestamp=timestamp,
+                index=gpu.index,
+                memory_used_mb=memory.used // (1024 * 1024),
+                memory_free_mb=memory.free // (1024 * 1024),
+                memory_total_mb=memory.total // (1024 * 1024),
+                utilization_gpu_percent=float(utilization.gpu),
+                utilization_memory_percent=float(utilization.memory),
+                temperature_c=pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU),
+                power_draw_w=power_draw,
+                power_limit_w=power_limit
+            ))
+
+        return metrics
+
+    def _sample_gpu_metrics_smi(self) -> List[GPUMetrics]:
+        """Sample current GPU metrics by polling nvidia-smi."""
         try:
             result = subprocess.run(
-                [
-                    "nvidia-smi",
-                    "--query-gpu=index,memory.used,memory.free,memory.total,"
-                    "utilization.gpu,utilization.memory,temperature.gpu,"
-                    "power.draw,power.limit",
-                    "--format=csv,noheader,nounits"
-                ],
+                ["nvidia-smi", _SMI_METRICS_QUERY, "--format=csv,noheader,nounits"],
                 capture_output=True,
                 text=True,
                 timeout=5
@@ -245,41 +587,7 @@ class SystemMetricsCollector:
             if result.returncode != 0:
                 return []
 
-            timestamp = time.time()
-            metrics = []
-
-            for line in result.stdout.strip().split('\n'):
-                if not line.strip():
-                    continue
-                parts = [p.strip() for p in line.split(',')]
-                if len(parts) >= 9:
-                    # Handle [N/A] values
-                    def parse_float(val, default=0.0):
-                        try:
-                            return float(val) if val and val != '[N/A]' else default
-                        except ValueError:
-                            return default
-
-                    def parse_int(val, default=0):
-                        try:
-                            return int(float(val)) if val and val != '[N/A]' else default
-                        except ValueError:
-                            return default
-
-                    metrics.append(GPUMetrics(
-                        timestamp=timestamp,
-                        index=parse_int(parts[0]),
-                        memory_used_mb=parse_int(parts[1]),
-                        memory_free_mb=parse_int(parts[2]),
-                        memory_total_mb=parse_int(parts[3]),
-                        utilization_gpu_percent=parse_float(parts[4]),
-                        utilization_memory_percent=parse_float(parts[5]),
-                        temperature_c=parse_int(parts[6]),
-                        power_draw_w=parse_float(parts[7]),
-                        power_limit_w=parse_float(parts[8])
-                    ))
-
-            return metrics
+            return _parse_gpu_metrics(result.stdout.strip().split('\n'), time.time())
 
         except Exception as e:
             logger.debug(f"Failed to sample GPU metrics: {e}")
@@ -288,26 +596,26 @@ class SystemMetricsCollector:
     def _sample_system_metrics(self) -> Optional[SystemMetrics]:
         """Sample current system metrics."""
         try:
-            # CPU usage from /proc/stat
+            # CPU usage from /proc/stat, as busy time since the previous sample
             cpu_percent = 0.0
-            try:
-                import psutil
-                cpu_percent = psutil.cpu_percent(interval=None)
-            except ImportError:
-                # Fallback: read from /proc/stat
-                pass
-
-            # Memory from /proc/meminfo
-            memory_total = 0
+            cpu_times = _read_cpu_times()
+            if cpu_times is not None:
+                busy, total = cpu_times
+                prev_busy, prev_total = self._prev_cpu_times
+                if total > prev_total:
+                    cpu_percent = 100.0 * (busy - prev_busy) / (total - prev_total)
+                self._prev_cpu_times = cpu_times
+
+            # Memory from /proc/meminfo. MemTotal never changes, so it is
+            # cached; MemAvailable is the third line, so only the head is read
+            memory_total = self._mem_total_mb
             memory_available = 0
 
             try:
-                with open('/proc/meminfo', 'r') as f:
-                    for line in f:
-                        if line.startswith('MemTotal:'):
-                            memory_total = int(line.split()[1]) // 1024  # KB to MB
-                        elif line.startswith('MemAvailable:'):
-                            memory_available = int(line.split()[1]) // 1024
+                buf = _read_proc('/proc/meminfo', 512)
+                if not memory_total:
+                    memory_total = self._mem_total_mb = _meminfo_kb(buf, b'MemTotal:') // 1024  # KB to MB
+                memory_available = _meminfo_kb(buf, b'MemAvailable:') // 1024
             except Exception:
                 pass
 
@@ -328,18 +636,130 @@ class SystemMetricsCollector:
 
     def _collection_loop(self):
         """Background thread for collecting metrics."""
+        # Sleep to fixed monotonic deadlines so sampling time does not
+        # accumulate as drift; the stop event wakes the wait immediately
+        next_tick = time.monotonic()
+        gpu_errors = 0
+        gpu_retry_at = next_tick
+        sample_gpus = bool(self._gpu_info)
+
         while self._collecting:
-            # Sample GPU metrics
-            gpu_metrics = self._sample_gpu_metrics()
-            if gpu_metrics:
-                self._gpu_samples.append(gpu_metrics)
+            smi_proc = self._smi_proc
+            if smi_proc is not None and smi_proc.poll() is not None:
+                logger.warning("nvidia-smi stream exited, polling GPU metrics instead")
+                self._smi_proc = smi_proc = None
+
+            # Sample GPU metrics, unless nvidia-smi is streaming them
+            if sample_gpus and smi_proc is None and next_tick >= gpu_retry_at:
+                gpu_metrics = self._sample_gpu_metrics()
+                if gpu_metrics:
+                    self._add_gpu_sample(gpu_metrics)
+                    gpu_errors = 0
+                else:
+                    gpu_errors += 1
+                    if gpu_errors >= _GPU_MAX_CONSECUTIVE_ERRORS:
+                        logger.warning(f"GPU sampling failed {gpu_errors} times in a row, disabling it for this run")
+                        sample_gpus = False
+                    else:
+                        backoff = min(self.sample_interval * 2 ** gpu_errors, _GPU_MAX_BACKOFF_SEC)
+                        gpu_retry_at = next_tick + backoff
 
             # Sample system metrics
             system_metrics = self._sample_system_metrics()
             if system_metrics:
-                self._system_samples.append(system_metrics)
+                self._add_system_sample(system_metrics)
+
+            next_tick += self.sample_interval
+            now = time.monotonic()
+            if next_tick < now:
+                # Fell behind by more than an interval; skip missed ticks
+                next_tick = now
+            if self._stop_event.wait(next_tick - now):
+                break
 
-            time.sleep(self.sample_interval)
+    def _start_smi_stream(self):
+        """
+        Start a looping nvidia-smi that streams one CSV row per GPU per tick.
+
+        This replaces a fork/exec of nvidia-smi per sample when NVML is not
+        available. The rows are read by _smi_stream_loop.
+        """
+        interval_ms = max(1, int(self.sample_interval * 1000))
+        try:
+            self._smi_proc = subprocess.Popen(
+                ["nvidia-smi", "-lms", str(interval_ms), _SMI_METRICS_QUERY, "--format=csv,noheader,nounits"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+        except OSError as e:
+            logger.debug(f"Failed to start nvidia-smi stream: {e}")
+            self._smi_proc = None
+            return
+
+        self._smi_thread = threading.Thread(target=self._smi_stream_loop, args=(self._smi_proc,), daemon=True)
+        self._smi_thread.start()
+
+    def _stop_smi_stream(self):
+        """Terminate the looping nvidia-smi and its reader thread."""
+        proc, self._smi_proc = self._smi_proc, None
+        if proc is None:
+            return
+        proc.terminate()
+        try:
+            proc.wait(timeout=2.0)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        if self._smi_thread:
+            self._smi_thread.join(timeout=2.0)
+            self._smi_thread = None
+
+    def _smi_stream_loop(self, proc: subprocess.Popen):
+        """Group streamed nvidia-smi rows into samples until the process exits."""
+        num_gpus = len(self._gpu_info)
+        rows: List[str] = []
+        for line in proc.stdout:
+            if not line.strip():
+                continue
+            rows.append(line)
+            if len(rows) == num_gpus:
+                gpu_metrics = _parse_gpu_metrics(rows, time.time())
+                if gpu_metrics:
+                    self._add_gpu_sample(gpu_metrics)
+                rows = []
+
+    def _add_gpu_sample(self, gpu_metrics: List[GPUMetrics]):
+        """Write one GPU sample into the history ring and fold it into the running aggregates."""
+        with self._lock:
+            n = self._n_gpu_samples
+            row = self._gpu_ring[n % _GPU_HISTORY_CAPACITY]
+            row.fill(0.0)
+            # Samples are in the same GPU order as _gpu_info, both for NVML
+            # handles and for nvidia-smi rows, so rows are filled by position
+            for i, (m, info) in enumerate(zip(gpu_metrics, self._gpu_info)):
+                total_mem = m.memory_total_mb or info.memory_total_mb
+                row[i] = (
+                    m.utilization_gpu_percent,
+                    m.memory_used_mb,
+                    m.memory_used_mb / total_mem * 100 if total_mem > 0 else 0.0,
+                    m.temperature_c,
+                    m.power_draw_w,
+                )
+
+            self._gpu_sum += row
+            np.maximum(self._gpu_max, row, out=self._gpu_max)
+            self._n_gpu_samples = n + 1
+
+    def _add_system_sample(self, system_metrics: SystemMetrics):
+        """Fold one system sample into the running sums and maxima."""
+        with self._lock:
+            self._cpu_sum += system_metrics.cpu_percent
+            if system_metrics.cpu_percent > self._cpu_max:
+                self._cpu_max = system_metrics.cpu_percent
+            self._mem_sum += system_metrics.memory_used_mb
+            if system_metrics.memory_used_mb > self._mem_max:
+                self._mem_max = system_metrics.memory_used_mb
+            self._n_system_samples += 1
 
     def start(self):
         """Start collecting metrics in background."""
@@ -349,12 +769,33 @@ class SystemMetricsCollector:
         # Get GPU info first
         self.get_gpu_info()
 
-        # Clear previous samples
-        self._gpu_samples = []
-        self._system_samples = []
+        # Only worth measuring when sampling faster than NVML may refresh power
+        if self._handles and self.sample_interval < _POWER_PROBE_SEC and not any(self._power_period_s):
+            try:
+                self._probe_power_period()
+            except pynvml.NVMLError as e:
+                logger.debug(f"Failed to probe NVML power update period: {e}")
+
+        # Clear previous samples; CPU usage is measured from here
+        self._prev_cpu_times = _read_cpu_times() or (0, 0)
+        shape = (len(self._gpu_info), len(_GPU_FIELDS))
+        self._gpu_ring = np.zeros((_GPU_HISTORY_CAPACITY,) + shape)
+        self._gpu_sum = np.zeros(shape)
+        self._gpu_max = np.zeros(shape)
+        self._n_gpu_samples = 0
+        self._cpu_sum = 0.0
+        self._cpu_max = 0.0
+        self._mem_sum = 0
+        self._mem_max = 0
+        self._n_system_samples = 0
+
+        # Without NVML, stream GPU samples from one long-running nvidia-smi
+        if self._gpu_info and not self._handles:
+            self._start_smi_stream()
 
         # Start collection thread
         self._collecting = True
+        self._stop_event.clear()
         self._thread = threading.Thread(target=self._collection_loop, daemon=True)
         self._thread.start()
 
@@ -363,89 +804,65 @@ class SystemMetricsCollector:
     def stop(self) -> MetricsSummary:
         """Stop collecting and return summary."""
         self._collecting = False
+        self._stop_event.set()
 
         if self._thread:
             self._thread.join(timeout=2.0)
             self._thread = None
 
-        logger.info(f"Stopped metrics collection, {len(self._gpu_samples)} GPU samples, "
-                   f"{len(self._system_samples)} system samples")
+        self._stop_smi_stream()
+
+        logger.info(f"Stopped metrics collection, {self._n_gpu_samples} GPU samples, "
+                   f"{self._n_system_samples} system samples")
 
         return self._compute_summary()
 
     def _compute_summary(self) -> MetricsSummary:
         """Compute summary statistics from collected samples."""
+        with self._lock:
+            return self._compute_summary_locked()
+
+    def _compute_summary_locked(self) -> MetricsSummary:
         summary = MetricsSummary(
             gpu_count=len(self._gpu_info),
             gpu_info=self._gpu_info,
-            sample_count=len(self._gpu_samples)
+            sample_count=self._n_gpu_samples
         )
 
         # Compute GPU metrics summary
-        if self._gpu_samples and self._gpu_info:
-            num_gpus = len(self._gpu_info)
-
-            # Initialize per-GPU lists
-            for _ in range(num_gpus):
-                summary.gpu_utilization_mean.append(0.0)
-                summary.gpu_utilization_max.append(0.0)
-                summary.gpu_memory_used_mean_mb.append(0.0)
-                summary.gpu_memory_used_max_mb.append(0.0)
-                summary.gpu_memory_percent_mean.append(0.0)
-                summary.gpu_temperature_mean_c.append(0.0)
-                summary.gpu_temperature_max_c.append(0)
-                summary.gpu_power_draw_mean_w.append(0.0)
-                summary.gpu_power_draw_max_w.append(0.0)
-
-            # Aggregate samples
-            for sample in self._gpu_samples:
-                for gpu_metric in sample:
-                    idx = gpu_metric.index
-                    if idx < num_gpus:
-                        summary.gpu_utilization_mean[idx] += gpu_metric.utilization_gpu_percent
-                        summary.gpu_utilization_max[idx] = max(
-                            summary.gpu_utilization_max[idx],
-                            gpu_metric.utilization_gpu_percent
-                        )
-                        summary.gpu_memory_used_mean_mb[idx] += gpu_metric.memory_used_mb
-                        summary.gpu_memory_used_max_mb[idx] = max(
-                            summary.gpu_memory_used_max_mb[idx],
-                            gpu_metric.memory_used_mb
-                        )
-                        total_mem = gpu_metric.memory_total_mb or self._gpu_info[idx].memory_total_mb
-                        if total_mem > 0:
-                            pct = gpu_metric.memory_used_mb / total_mem * 100
-                            summary.gpu_memory_percent_mean[idx] += pct
-                        summary.gpu_temperature_mean_c[idx] += gpu_metric.temperature_c
-                        summary.gpu_temperature_max_c[idx] = max(
-                            summary.gpu_temperature_max_c[idx],
-                            gpu_metric.temperature_c
-                        )
-                        summary.gpu_power_draw_mean_w[idx] += gpu_metric.power_draw_w
-                        summary.gpu_power_draw_max_w[idx] = max(
-                            summary.gpu_power_draw_max_w[idx],
-                            gpu_metric.power_draw_w
-                        )
-
-            # Compute means
-            n_samples = len(self._gpu_samples)
-            if n_samples > 0:
-                for i in range(num_gpus):
-                    summary.gpu_utilization_mean[i] /= n_samples
-                    summary.gpu_memory_used_mean_mb[i] /= n_samples
-                    summary.gpu_memory_percent_mean[i] /= n_samples
-                    summary.gpu_temperature_mean_c[i] /= n_samples
-                    summary.gpu_power_draw_mean_w[i] /= n_samples
+        n_samples = self._n_gpu_samples
+        if n_samples and self._gpu_info:
+            means = self._gpu_sum / n_samples  # (num_gpus, fields)
+            maxes = self._gpu_max
+
+            summary.gpu_utilization_mean = means[:, _F_UTIL].tolist()
+            summary.gpu_utilization_max = maxes[:, _F_UTIL].tolist()
+            summary.gpu_memory_used_mean_mb = means[:, _F_MEM_USED].tolist()
+            summary.gpu_memory_used_max_mb = maxes[:, _F_MEM_USED].tolist()
+            summary.gpu_memory_percent_mean = means[:, _F_MEM_PCT].tolist()
+            summary.gpu_temperature_mean_c = means[:, _F_TEMP].tolist()
+            summary.gpu_temperature_max_c = maxes[:, _F_TEMP].astype(int).tolist()
+            summary.gpu_power_draw_mean_w = means[:, _F_POWER].tolist()
+            summary.gpu_power_draw_max_w = maxes[:, _F_POWER].tolist()
+
+            # Tail percentiles need the trace, so they cover the history ring
+            history = self._gpu_ring[:min(n_samples, _GPU_HISTORY_CAPACITY)]
+            util_pct = np.percentile(history[:, :, _F_UTIL], [50, 95, 99], axis=0)
+            power_pct = np.percentile(history[:, :, _F_POWER], [50, 95, 99], axis=0)
+            (summary.gpu_utilization_p50,
+             summary.gpu_utilization_p95,
+             summary.gpu_utilization_p99) = util_pct.tolist()
+            (summary.gpu_power_draw_p50_w,
+             summary.gpu_power_draw_p95_w,
+             summary.gpu_power_draw_p99_w) = power_pct.tolist()
 
         # Compute system metrics summary
-        if self._system_samples:
-            cpu_values = [s.cpu_percent for s in self._system_samples]
-            memory_values = [s.memory_used_mb for s in self._system_samples]
-
-            summary.cpu_percent_mean = sum(cpu_values) / len(cpu_values)
-            summary.cpu_percent_max = max(cpu_values)
-            summary.memory_used_mean_mb = sum(memory_values) / len(memory_values)
-            summary.memory_used_max_mb = max(memory_values)
+        n_system = self._n_system_samples
+        if n_system:
+            summary.cpu_percent_mean = self._cpu_sum / n_system
+            summary.cpu_percent_max = self._cpu_max
+            summary.memory_used_mean_mb = self._mem_sum / n_system
+            summary.memory_used_max_mb = self._mem_max
 
         return summary
 
@@ -456,7 +873,7 @@ class SystemMetricsCollector:
         system_metrics = self._sample_system_metrics()
 
         snapshot = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "gpus": [],
             "system": {}
         }
@@ -493,6 +910,113 @@ class SystemMetricsCollector:
         return snapshot
 
 
+def _collector_process_main(conn, sample_interval: float):
+    """Entry point of the ProcessMetricsCollector child process."""
+    collector = SystemMetricsCollector(sample_interval=sample_interval)
+    collector.start()
+    conn.send(None)  # Sampling has started
+    try:
+        conn.recv()  # Blocks until the parent calls stop()
+    except EOFError:
+        # Parent went away without stopping us
+        collector.stop()
+        return
+    conn.send(collector.stop())
+    conn.close()
+
+
+class ProcessMetricsCollector:
+    """
+    SystemMetricsCollector running in a separate process.
+
+    NVML calls, /proc reads and nvidia-smi parsing all happen in the child,
+    so the sampler thread cannot take the GIL away from the event loop while
+    requests are being timed. The child folds samples into the usual running
+    aggregates and sends the MetricsSummary back over a pipe on stop().
+
+    Snapshots taken before start() are still sampled in-process.
+    """
+
+    def __init__(self, sample_interval: float = 1.0):
+        """
+        Initialize metrics collector.
+
+        Args:
+            sample_interval: Seconds between metric samples
+        """
+        self.sample_interval = sample_interval
+        self._local = SystemMetricsCollector(sample_interval=sample_interval)
+        self._process: Optional[multiprocessing.Process] = None
+        self._conn = None
+
+    def get_gpu_info(self) -> List[GPUInfo]:
+        """Get static GPU information."""
+        return self._local.get_gpu_info()
+
+    def get_current_snapshot(self) -> Dict[str, Any]:
+        """Get current metrics snapshot without starting collection."""
+        return self._local.get_current_snapshot()
+
+    def start(self):
+        """
+        Start the collector process.
+
+        Blocks until the child has taken its first sample, so the
+        collection window covers everything that runs after this returns.
+        """
+        if self._process is not None:
+            return
+
+        # spawn rather than fork: the parent has live threads (log listener,
+        # event loop executors) whose locks a forked child would inherit
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_collector_process_main,
+            args=(child_conn, self.sample_interval),
+            name="system-metrics",
+            daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+
+        try:
+            if self._conn.poll(_PROCESS_START_TIMEOUT_SEC):
+                self._conn.recv()
+                logger.info(f"Started system metrics collection in process {self._process.pid}")
+                return
+        except EOFError:
+            pass
+        logger.warning("System metrics process failed to start, no metrics will be collected")
+
+    def stop(self) -> MetricsSummary:
+        """Stop the collector process and return its summary."""
+        process, conn = self._process, self._conn
+        self._process = self._conn = None
+        if process is None:
+            return MetricsSummary()
+
+        summary = None
+        try:
+            conn.send(None)
+            if conn.poll(_PROCESS_STOP_TIMEOUT_SEC):
+                summary = conn.recv()
+        except (EOFError, OSError) as e:
+            logger.debug(f"System metrics process pipe closed: {e}")
+        finally:
+            conn.close()
+
+        process.join(timeout=2.0)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+        if summary is None:
+            logger.warning("System metrics process returned no summary")
+            return MetricsSummary()
+        return summary
+
+
 def print_gpu_info():
     """Print GPU information to console."""
     collector = SystemMetricsCollector()
@@ -11,13 +11,17 @@ Measures individual component latencies in the PersonaPlex pipeline:
 6. Full pipeline latency
 """
 import asyncio
+import importlib.util
+import re
+import socket
+import struct
 import time
 import wave
 import numpy as np
 import json
 import sys
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 from urllib.parse import urlencode
 
@@ -27,6 +31,19 @@ sys.path.insert(0, str(BENCHMARK_DIR))
 
 from audio.samples import SampleManager
 from core.metrics import audio_to_tokens, bytes_to_audio_duration
+from core._audio_kernels import first_voiced
+from core._eventloop import install_uvloop, running_loop_name
+
+
+# Summary table bar segments; a bar is a prefix of each
+_BAR_WIDTH = 20
+_FULL = "█" * _BAR_WIDTH
+_EMPTY = "░" * _BAR_WIDTH
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    """Percentile of a list of samples, or 0.0 if there are none."""
+    return float(np.percentile(samples, q)) if samples else 0.0
 
 
 @dataclass
@@ -37,21 +54,58 @@ class LatencyBreakdown:
     input_tokens: int = 0
     output_tokens: int = 0
 
-    # Direct PersonaPlex (no encoding overhead)
-    direct_ttft_ms: float = 0.0
-    direct_e2e_ms: float = 0.0
+    # Direct PersonaPlex (no encoding overhead), one sample per iteration
+    direct_ttft_samples: list[float] = field(default_factory=list)
+    direct_e2e_samples: list[float] = field(default_factory=list)
 
     # Opus encoding/decoding
-    opus_encode_ms: float = 0.0
-    opus_decode_ms: float = 0.0
+    opus_encode_samples: list[float] = field(default_factory=list)
+    opus_decode_samples: list[float] = field(default_factory=list)
+    opus_decode_packet_samples: list[float] = field(default_factory=list)
 
     # Network latencies
     network_rtt_ms: float = 0.0  # Round-trip to PersonaPlex
     backend_rtt_ms: float = 0.0  # Round-trip to backend
+    # Raw RTT without the TCP handshake (ICMP/UDP probe), 0.0 if not measured
+    network_raw_rtt_ms: float = 0.0
+    backend_raw_rtt_ms: float = 0.0
 
-    # Full pipeline
-    pipeline_ttft_ms: float = 0.0
-    pipeline_e2e_ms: float = 0.0
+    # Full pipeline, one sample per iteration
+    pipeline_ttft_samples: list[float] = field(default_factory=list)
+    pipeline_e2e_samples: list[float] = field(default_factory=list)
+
+    # Headline latencies are medians, so one bad iteration does not skew them
+    @property
+    def direct_ttft_ms(self) -> float:
+        return _percentile(self.direct_ttft_samples, 50)
+
+    @property
+    def direct_ttft_p95_ms(self) -> float:
+        return _percentile(self.direct_ttft_samples, 95)
+
+    @property
+    def direct_e2e_ms(self) -> float:
+        return _percentile(self.direct_e2e_samples, 50)
+
+    @property
+    def opus_encode_ms(self) -> float:
+        return _percentile(self.opus_encode_samples, 50)
+
+    @property
+    def opus_decode_ms(self) -> float:
+        return _percentile(self.opus_decode_samples, 50)
+
+    @property
+    def pipeline_ttft_ms(self) -> float:
+        return _percentile(self.pipeline_ttft_samples, 50)
+
+    @property
+    def pipeline_ttft_p95_ms(self) -> float:
+        return _percentile(self.pipeline_ttft_samples, 95)
+
+    @property
+    def pipeline_e2e_ms(self) -> float:
+        return _percentile(self.pipeline_e2e_samples, 50)
 
     # Calculated overheads
     @property
@@ -65,55 +119,203 @@ class LatencyBreakdown:
         return self.opus_encode_ms + self.opus_decode_ms
 
     def to_dict(self) -> dict:
+        tokens_per_second = self.input_tokens / self.audio_duration_s if self.audio_duration_s > 0 else 0.0
+
+        # Round every reported float in one vectorized call; the unpack
+        # order below must match this list
+        (
+            duration_s, tokens_per_s,
+            direct_ttft, direct_e2e, direct_ttft_p95,
+            encode, decode, encode_p95, decode_p95,
+            decode_packet_p50, decode_packet_p95, encoding_total,
+            personaplex_rtt, backend_rtt, personaplex_raw_rtt, backend_raw_rtt,
+            pipeline_ttft, pipeline_e2e, pipeline_ttft_p95,
+            backend_processing,
+        ) = np.round(np.array([
+            self.audio_duration_s, tokens_per_second,
+            self.direct_ttft_ms, self.direct_e2e_ms, self.direct_ttft_p95_ms,
+            self.opus_encode_ms, self.opus_decode_ms,
+            _percentile(self.opus_encode_samples, 95),
+            _percentile(self.opus_decode_samples, 95),
+            _percentile(self.opus_decode_packet_samples, 50),
+            _percentile(self.opus_decode_packet_samples, 95),
+            self.total_encoding_overhead_ms,
+            self.network_rtt_ms, self.backend_rtt_ms,
+            self.network_raw_rtt_ms, self.backend_raw_rtt_ms,
+            self.pipeline_ttft_ms, self.pipeline_e2e_ms, self.pipeline_ttft_p95_ms,
+            self.backend_overhead_ms,
+        ], dtype=np.float64), 2).tolist()
+
         return {
             "audio_input": {
-                "duration_seconds": round(self.audio_duration_s, 2),
+                "duration_seconds": duration_s,
                 "input_tokens": self.input_tokens,
                 "output_tokens": self.output_tokens,
-                "tokens_per_second_audio": round(self.input_tokens / self.audio_duration_s, 2) if self.audio_duration_s > 0 else 0,
+                "tokens_per_second_audio": tokens_per_s,
             },
             "direct_personaplex": {
-                "ttft_ms": round(self.direct_ttft_ms, 2),
-                "e2e_ms": round(self.direct_e2e_ms, 2),
+                "ttft_ms": direct_ttft,
+                "e2e_ms": direct_e2e,
+                "ttft_p50_ms": direct_ttft,
+                "ttft_p95_ms": direct_ttft_p95,
+                "iterations": len(self.direct_ttft_samples),
             },
             "opus_processing": {
-                "encode_ms": round(self.opus_encode_ms, 2),
-                "decode_ms": round(self.opus_decode_ms, 2),
-                "total_ms": round(self.total_encoding_overhead_ms, 2),
+                "encode_ms": encode,
+                "decode_ms": decode,
+                "encode_p95_ms": encode_p95,
+                "decode_p95_ms": decode_p95,
+                "decode_packet_p50_ms": decode_packet_p50,
+                "decode_packet_p95_ms": decode_packet_p95,
+                "total_ms": encoding_total,
             },
             "network": {
-                "personaplex_rtt_ms": round(self.network_rtt_ms, 2),
-                "backend_rtt_ms": round(self.backend_rtt_ms, 2),
+                "personaplex_rtt_ms": personaplex_rtt,
+                "backend_rtt_ms": backend_rtt,
+                "personaplex_raw_rtt_ms": personaplex_raw_rtt,
+                "backend_raw_rtt_ms": backend_raw_rtt,
             },
             "full_pipeline": {
-                "ttft_ms": round(self.pipeline_ttft_ms, 2),
-                "e2e_ms": round(self.pipeline_e2e_ms, 2),
+                "ttft_ms": pipeline_ttft,
+                "e2e_ms": pipeline_e2e,
+                "ttft_p50_ms": pipeline_ttft,
+                "ttft_p95_ms": pipeline_ttft_p95,
+                "iterations": len(self.pipeline_ttft_samples),
             },
             "calculated_overhead": {
-                "backend_processing_ms": round(self.backend_overhead_ms, 2),
-                "total_encoding_ms": round(self.total_encoding_overhead_ms, 2),
+                "backend_processing_ms": backend_processing,
+                "total_encoding_ms": encoding_total,
             }
         }
 
+    def to_arrow(self):
+        """
+        Per-iteration samples as a pyarrow Table, one row per iteration.
+
+        The to_dict() summary is stored as JSON in the schema metadata
+        under b"summary". Requires pyarrow.
+        """
+        import pyarrow as pa
+
+        columns = {
+            "direct_ttft_ms": self.direct_ttft_samples,
+            "direct_e2e_ms": self.direct_e2e_samples,
+            "pipeline_ttft_ms": self.pipeline_ttft_samples,
+            "pipeline_e2e_ms": self.pipeline_e2e_samples,
+        }
+        n = max(len(v) for v in columns.values())
+        table = pa.table({
+            "iteration": pa.array(list(range(n)), type=pa.int32()),
+            **{
+                name: pa.array(values + [None] * (n - len(values)), type=pa.float64())
+                for name, values in columns.items()
+            },
+        })
+        return table.replace_schema_metadata({b"summary": json.dumps(self.to_dict())})
+
+# SO_LINGER on with a zero timeout: close() sends RST instead of FIN, so
+# probe sockets do not pile up in TIME_WAIT between measurements
+_LINGER_RST = struct.pack("ii", 1, 0)
 
-async def measure_network_latency(host: str, port: int) -> float:
-    """Measure TCP connection latency."""
+
+async def _tcp_connect_times(host: str, port: int) -> list[float]:
     times = []
     for _ in range(5):
-        start = time.perf_counter()
+        start = time.perf_counter_ns()
         try:
             reader, writer = await asyncio.wait_for(
                 asyncio.open_connection(host, port),
                 timeout=5.0
             )
-            elapsed = (time.perf_counter() - start) * 1000
+            elapsed = (time.perf_counter_ns() - start) * 1e-6
             times.append(elapsed)
+            sock = writer.get_extra_info("socket")
+            if sock is not None:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RST)
             writer.close()
             await writer.wait_closed()
         except Exception as e:
             print(f"Connection error: {e}")
+    return times
 
-    return np.mean(times) if times else 0.0
+
+async def _udp_echo_times(host: str, port: int) -> list[float]:
+    loop = asyncio.get_running_loop()
+    times = []
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.setblocking(False)
+        try:
+            sock.connect((host, port))
+        except OSError as e:
+            print(f"UDP error: {e}")
+            return times
+        for _ in range(5):
+            start = time.perf_counter_ns()
+            try:
+                await loop.sock_sendall(sock, b"\x00")
+                await asyncio.wait_for(loop.sock_recv(sock, 1), timeout=2.0)
+                times.append((time.perf_counter_ns() - start) * 1e-6)
+            except (OSError, asyncio.TimeoutError) as e:
+                print(f"UDP echo error: {e!r}")
+    return times
+
+
+_PING_AVG_RE = re.compile(rb"= [\d.]+/([\d.]+)/")
+
+# ping sends its 5 probes 0.2s apart and gives up after _PING_DEADLINE_SEC;
+# the extra second covers process startup before the probe is abandoned
+_PING_DEADLINE_SEC = 2
+
+
+async def _icmp_rtt(host: str) -> float:
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ping", "-c", "5", "-i", "0.2", "-w", str(_PING_DEADLINE_SEC), "-q", host,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+    except FileNotFoundError:
+        print("ICMP probe skipped: ping not found")
+        return 0.0
+    try:
+        async with asyncio.timeout(_PING_DEADLINE_SEC + 1):
+            stdout, _ = await proc.communicate()
+    except TimeoutError:
+        proc.kill()
+        await proc.wait()
+        print(f"ICMP probe timed out for {host}")
+        return 0.0
+    match = _PING_AVG_RE.search(stdout)
+    if match is None:
+        print(f"ICMP probe failed for {host}")
+        return 0.0
+    return float(match.group(1))
+
+
+async def measure_network_latency(host: str, port: int, mode: str = "tcp") -> float:
+    """
+    Measure network latency to a host.
+
+    Args:
+        host: Target host
+        port: TCP port for "tcp", UDP echo port for "udp"; unused for "icmp"
+        mode: "tcp" times the connect handshake (what a client pays per
+            connection), "udp" times a one-byte round trip to a UDP echo
+            service, "icmp" reports the average from the system ping
+
+    Returns:
+        Mean latency in milliseconds, or 0.0 if no probe succeeded
+    """
+    if mode == "icmp":
+        return await _icmp_rtt(host)
+    if mode == "udp":
+        times = await _udp_echo_times(host, port)
+    elif mode == "tcp":
+        times = await _tcp_connect_times(host, port)
+    else:
+        raise ValueError(f"Unknown latency probe mode: {mode}")
+
+    return sum(times) / len(times) if times else 0.0
 
 
 async def measure_websocket_rtt(url: str, timeout: float = 5.0) -> float:
@@ -122,77 +324,127 @@ async def measure_websocket_rtt(url: str, timeout: float = 5.0) -> float:
 
     times = []
     for _ in range(3):
-        start = time.perf_counter()
+        start = time.perf_counter_ns()
         try:
             ws = await asyncio.wait_for(
                 websockets.connect(url),
                 timeout=timeout
             )
-            elapsed = (time.perf_counter() - start) * 1000
+            elapsed = (time.perf_counter_ns() - start) * 1e-6
             times.append(elapsed)
             await ws.close()
         except Exception as e:
             print(f"WebSocket error: {e}")
 
-    return np.mean(times) if times else 0.0
+    return sum(times) / len(times) if times else 0.0
 
 
-def measure_opus_encoding(audio_samples: np.ndarray, sample_rate: int = 24000) -> tuple[bytes, float]:
-    """Measure Opus encoding latency."""
-    import sphn
+def pcm16_to_float32(samples: np.ndarray) -> np.ndarray:
+    """Convert int16 PCM to contiguous float32 in [-1, 1)."""
+    return np.ascontiguousarray(samples, dtype=np.float32) * np.float32(1.0 / 32768.0)
 
-    opus_writer = sphn.OpusStreamWriter(sample_rate)
 
-    # Convert to float32 if needed
-    if audio_samples.dtype != np.float32:
-        audio_float = audio_samples.astype(np.float32) / 32768.0
-    else:
-        audio_float = audio_samples
+def direct_ws_url(host: str, port: int, text_prompt: str = "You are a helpful assistant.") -> str:
+    """PersonaPlex chat WebSocket URL, with the config in the query string."""
+    query = urlencode({'text_prompt': text_prompt})
+    return f"ws://{host}:{port}/api/chat?{query}"
+
+
+async def ws_connect(url: str, handshake_sem: Optional[asyncio.Semaphore] = None):
+    """
+    Open a measurement WebSocket connection.
+
+    If handshake_sem is given it is held only for the opening handshake,
+    capping how many handshakes are in flight at once.
+    """
+    import websockets
 
-    # Measure encoding time
-    start = time.perf_counter()
-    opus_data = opus_writer.append_pcm(audio_float)
-    encode_time = (time.perf_counter() - start) * 1000
+    if handshake_sem is None:
+        return await websockets.connect(url, ping_interval=None, compression=None)
+    async with handshake_sem:
+        return await websockets.connect(url, ping_interval=None, compression=None)
 
-    return opus_data, encode_time
 
+def benchmark_opus(
+    audio_float: np.ndarray,
+    iterations: int = 5,
+    sample_rate: int = 24000,
+    chunk_samples: int = 1920
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Time repeated Opus encodes and decodes of the same audio.
+
+    All iterations run in one call with the timer bound to a local, so the
+    per-iteration cost outside the codec is one perf_counter_ns pair.
 
-def measure_opus_decoding(opus_data: bytes, sample_rate: int = 24000) -> tuple[np.ndarray, float]:
-    """Measure Opus decoding latency."""
+    Encodes share one stream writer, as a live session does, so only the
+    first iteration pays encoder setup and later ones measure a warm
+    encoder.
+
+    Decoding is timed the way the pipeline receives audio: the stream is
+    encoded once in chunk_samples pieces and each resulting packet is fed
+    to the reader separately. Each decode iteration needs a fresh reader
+    because the stream headers are only emitted once; readers are
+    created outside the timed region.
+
+    Returns:
+        (encode_ms, decode_ms, decode_packet_ms): per-iteration encode and
+        total decode times, and per-packet decode times over all iterations
+    """
     import sphn
 
-    opus_reader = sphn.OpusStreamReader(sample_rate)
+    perf_ns = time.perf_counter_ns
+    encode_ns = np.empty(iterations, dtype=np.int64)
 
-    start = time.perf_counter()
-    pcm = opus_reader.append_bytes(opus_data)
-    decode_time = (time.perf_counter() - start) * 1000
+    writer = sphn.OpusStreamWriter(sample_rate)
+    for i in range(iterations):
+        start = perf_ns()
+        writer.append_pcm(audio_float)
+        encode_ns[i] = perf_ns() - start
+
+    packet_writer = sphn.OpusStreamWriter(sample_rate)
+    packets = [
+        packet for packet in (
+            packet_writer.append_pcm(audio_float[i:i+chunk_samples])
+            for i in range(0, len(audio_float), chunk_samples)
+        )
+        if packet
+    ]
+    packet_ns = np.empty((iterations, len(packets)), dtype=np.int64)
+
+    for i in range(iterations):
+        reader = sphn.OpusStreamReader(sample_rate)
+        row = packet_ns[i]
+        for j, packet in enumerate(packets):
+            start = perf_ns()
+            reader.append_bytes(packet)
+            row[j] = perf_ns() - start
 
-    return pcm, decode_time
+    decode_ns = packet_ns.sum(axis=1)
+    return encode_ns * 1e-6, decode_ns * 1e-6, packet_ns.ravel() * 1e-6
 
 
 async def measure_direct_personaplex(
-    audio_samples: np.ndarray,
+    audio_float: np.ndarray,
     host: str = "localhost",
     port: int = 8998,
-    text_prompt: str = "You are a helpful assistant."
+    text_prompt: str = "You are a helpful assistant.",
+    realtime_pacing: bool = True,
+    handshake_sem: Optional[asyncio.Semaphore] = None
 ) -> tuple[float, float]:
     """
     Measure direct PersonaPlex latency (with Opus encoding included).
+
+    audio_float is float32 PCM in [-1, 1), see pcm16_to_float32().
+    With realtime_pacing, chunks are sent at playback speed; otherwise
+    they are sent back to back. handshake_sem is passed to ws_connect().
     Returns (ttft_ms, e2e_ms)
     """
-    import websockets
     import sphn
 
     opus_writer = sphn.OpusStreamWriter(24000)
 
-    # Convert audio
-    audio_float = audio_samples.astype(np.float32) / 32768.0
-
-    # Connect with config in URL
-    query = urlencode({'text_prompt': text_prompt})
-    ws_url = f"ws://{host}:{port}/api/chat?{query}"
-
-    ws = await websockets.connect(ws_url, ping_interval=20)
+    ws = await ws_connect(direct_ws_url(host, port, text_prompt), handshake_sem)
 
     # Wait for handshake
     handshake = await asyncio.wait_for(ws.recv(), timeout=30.0)
@@ -204,72 +456,80 @@ async def measure_direct_personaplex(
     first_response_time = None
     end_time = None
 
-    send_start = time.perf_counter()
+    send_start = time.perf_counter_ns()
 
     async def receive():
         nonlocal first_response_time, end_time
         audio_count = 0
-        while True:
-            try:
-                msg = await asyncio.wait_for(ws.recv(), timeout=30.0)
-                now = time.perf_counter()
-
-                if isinstance(msg, bytes) and len(msg) > 0:
-                    kind = msg[0]
-                    if kind == 1:  # Audio
-                        if first_response_time is None:
-                            first_response_time = now
-                        audio_count += 1
-                        end_time = now
-
-                        if audio_count > 10:
-                            return
-            except asyncio.TimeoutError:
-                return
+        perf_ns = time.perf_counter_ns
+        # One deadline for the whole receive, not a timer per message
+        try:
+            async with asyncio.timeout(30.0):
+                while True:
+                    msg = await ws.recv()
+                    now = perf_ns()
+
+                    if isinstance(msg, bytes) and len(msg) > 0:
+                        kind = msg[0]
+                        if kind == 1:  # Audio
+                            if first_response_time is None:
+                                first_response_time = now
+                            audio_count += 1
+                            end_time = now
+
+                            if audio_count > 10:
+                                return
+        except asyncio.TimeoutError:
+            return
 
     recv_task = asyncio.create_task(receive())
 
-    # Stream audio chunks
-    for i in range(0, len(audio_float), chunk_samples):
-        chunk = audio_float[i:i+chunk_samples]
-        if len(chunk) < chunk_samples:
-            chunk = np.pad(chunk, (0, chunk_samples - len(chunk)))
+    # Only whole chunks are sent, so every chunk is a view of the input
+    # and the loop needs no padding branch
+    n_samples = len(audio_float) // chunk_samples * chunk_samples
 
-        opus_data = opus_writer.append_pcm(chunk)
+    # Stream audio chunks
+    for i in range(0, n_samples, chunk_samples):
+        opus_data = opus_writer.append_pcm(audio_float[i:i+chunk_samples])
         if len(opus_data) > 0:
             await ws.send(b'\x01' + opus_data)
 
-        await asyncio.sleep(chunk_samples / 24000)
+        if realtime_pacing:
+            await asyncio.sleep(chunk_samples / 24000)
 
     await recv_task
     await ws.close()
 
-    ttft = (first_response_time - send_start) * 1000 if first_response_time else 0
-    e2e = (end_time - send_start) * 1000 if end_time else 0
+    ttft = (first_response_time - send_start) * 1e-6 if first_response_time is not None else 0
+    e2e = (end_time - send_start) * 1e-6 if end_time is not None else 0
 
     return ttft, e2e
 
 
 async def measure_pipeline_latency(
     audio_data: bytes,
+    client,
     backend_host: str = "localhost",
-    backend_port: int = 8000
+    backend_port: int = 8000,
+    realtime_pacing: bool = True,
+    handshake_sem: Optional[asyncio.Semaphore] = None
 ) -> tuple[float, float]:
     """
     Measure full pipeline latency through backend.
+
+    client is an httpx.AsyncClient for the backend, shared across iterations
+    so session create/delete reuse a pooled keep-alive connection.
+    realtime_pacing keeps a short gap between chunks; without it chunks are
+    sent back to back. handshake_sem is passed to ws_connect().
     Returns (ttft_ms, e2e_ms)
     """
-    import websockets
-    import httpx
-
     # Create session
-    async with httpx.AsyncClient(base_url=f"http://{backend_host}:{backend_port}") as client:
-        resp = await client.post('/sessions', json={'restaurant_id': 2})
-        session_id = resp.json()['session_id']
+    resp = await client.post('/sessions', json={'restaurant_id': 2})
+    session_id = resp.json()['session_id']
 
     # Connect to WebSocket
     ws_url = f"ws://{backend_host}:{backend_port}/ws/sessions/{session_id}/audio"
-    ws = await websockets.connect(ws_url, ping_interval=20)
+    ws = await ws_connect(ws_url, handshake_sem)
 
     # Wait briefly for connection
     await asyncio.sleep(0.5)
@@ -277,26 +537,29 @@ async def measure_pipeline_latency(
     first_response_time = None
     end_time = None
 
-    send_start = time.perf_counter()
+    send_start = time.perf_counter_ns()
 
     async def receive():
         nonlocal first_response_time, end_time
         audio_count = 0
-        while True:
-            try:
-                msg = await asyncio.wait_for(ws.recv(), timeout=30.0)
-                now = time.perf_counter()
+        perf_ns = time.perf_counter_ns
+        # One deadline for the whole receive, not a timer per message
+        try:
+            async with asyncio.timeout(30.0):
+                while True:
+                    msg = await ws.recv()
+                    now = perf_ns()
 
-                if isinstance(msg, bytes):
-                    if first_response_time is None:
-                        first_response_time = now
-                    audio_count += 1
-                    end_time = now
+                    if isinstance(msg, bytes):
+                        if first_response_time is None:
+                            first_response_time = now
+                        audio_count += 1
+                        end_time = now
 
-                    if audio_count > 10:
-                        return
-            except asyncio.TimeoutError:
-                return
+                        if audio_count > 10:
+                            return
+        except asyncio.TimeoutError:
+            return
 
     recv_task = asyncio.create_task(receive())
 
@@ -305,17 +568,17 @@ async def measure_pipeline_latency(
     for i in range(0, len(audio_data), chunk_size):
         chunk = audio_data[i:i+chunk_size]
         await ws.send(chunk)
-        await asyncio.sleep(0.01)
+        if realtime_pacing:
+            await asyncio.sleep(0.01)
 
     await recv_task
     await ws.close()
 
     # Cleanup session
-    async with httpx.AsyncClient(base_url=f"http://{backend_host}:{backend_port}") as client:
-        await client.delete(f'/sessions/{session_id}')
+    await client.delete(f'/sessions/{session_id}')
 
-    ttft = (first_response_time - send_start) * 1000 if first_response_time else 0
-    e2e = (end_time - send_start) * 1000 if end_time else 0
+    ttft = (first_response_time - send_start) * 1e-6 if first_response_time is not None else 0
+    e2e = (end_time - send_start) * 1e-6 if end_time is not None else 0
 
     return ttft, e2e
 
@@ -325,13 +588,32 @@ async def run_latency_breakdown(
     personaplex_host: str = "localhost",
     personaplex_port: int = 8998,
     backend_host: str = "localhost",
-    backend_port: int = 8000
+    backend_port: int = 8000,
+    realtime_pacing: bool = True,
+    parallel_phases: bool = False,
+    raw_rtt_mode: Optional[str] = None,
+    udp_echo_port: int = 7,
+    max_concurrent_handshakes: int = 16
 ) -> LatencyBreakdown:
-    """Run comprehensive latency breakdown analysis."""
+    """
+    Run comprehensive latency breakdown analysis.
+
+    With parallel_phases the direct and full pipeline measurements run
+    concurrently (iterations stay sequential within each). Only use it
+    when the backend talks to a different PersonaPlex instance than the
+    one probed directly - PersonaPlex serves one session at a time.
+
+    raw_rtt_mode ("icmp" or "udp") optionally adds a handshake-free RTT
+    probe next to the TCP connect time; "icmp" needs the system ping and
+    "udp" needs an echo service on udp_echo_port on both hosts. At most max_concurrent_handshakes
+    WebSocket opening handshakes run at once across all measurements.
+    """
+    import httpx
 
     print("=" * 70)
     print("LATENCY BREAKDOWN ANALYSIS")
     print("=" * 70)
+    print(f"Event loop: {running_loop_name()}")
 
     # Load audio sample
     sample_manager = SampleManager()
@@ -342,11 +624,15 @@ async def run_latency_breakdown(
 
     # Find speech and get 5 seconds
     threshold = 500
-    non_silent = np.where(np.abs(audio_samples) > threshold)[0]
-    start = max(0, non_silent[0] - 12000) if len(non_silent) > 0 else 0
+    first = first_voiced(audio_samples, threshold)
+    start = max(0, first - 12000) if first >= 0 else 0
     end = min(start + 5 * 24000, len(audio_samples))
+    # Whole 80ms chunks, so the direct and pipeline paths send the same audio
+    end = start + (end - start) // 1920 * 1920
     speech_samples = audio_samples[start:end]
     speech_bytes = speech_samples.tobytes()
+    # Converted once and shared by every Opus encode below
+    speech_float = pcm16_to_float32(speech_samples)
 
     audio_duration = len(speech_samples) / 24000
     input_tokens = audio_to_tokens(audio_duration)
@@ -358,82 +644,91 @@ async def run_latency_breakdown(
     breakdown.audio_duration_s = audio_duration
     breakdown.input_tokens = input_tokens
 
-    # 1. Measure network latencies
-    print("\n[1/6] Measuring network latencies...")
-    breakdown.network_rtt_ms = await measure_network_latency(personaplex_host, personaplex_port)
+    # 1-3. Network probes and Opus timing do not depend on each other, so run
+    # them together; the CPU-bound Opus loops go to a worker thread
+    print("\n[1-3/6] Measuring network latencies and Opus encode/decode latency...")
+    async def raw_rtt(host: str) -> float:
+        if raw_rtt_mode is None:
+            return 0.0
+        return await measure_network_latency(host, udp_echo_port, mode=raw_rtt_mode)
+
+    (
+        breakdown.network_rtt_ms,
+        breakdown.backend_rtt_ms,
+        breakdown.network_raw_rtt_ms,
+        breakdown.backend_raw_rtt_ms,
+        (encode_ms, decode_ms, decode_packet_ms),
+    ) = await asyncio.gather(
+        measure_network_latency(personaplex_host, personaplex_port),
+        measure_network_latency(backend_host, backend_port),
+        raw_rtt(personaplex_host),
+        raw_rtt(backend_host),
+        asyncio.to_thread(benchmark_opus, speech_float, 5),
+    )
+    breakdown.opus_encode_samples = encode_ms.tolist()
+    breakdown.opus_decode_samples = decode_ms.tolist()
+    breakdown.opus_decode_packet_samples = decode_packet_ms.tolist()
     print(f"  PersonaPlex TCP RTT: {breakdown.network_rtt_ms:.2f}ms")
-
-    breakdown.backend_rtt_ms = await measure_network_latency(backend_host, backend_port)
     print(f"  Backend TCP RTT: {breakdown.backend_rtt_ms:.2f}ms")
-
-    # 2. Measure Opus encoding
-    print("\n[2/6] Measuring Opus encoding latency...")
-    encode_times = []
-    for _ in range(5):
-        _, encode_time = measure_opus_encoding(speech_samples)
-        encode_times.append(encode_time)
-    breakdown.opus_encode_ms = np.mean(encode_times)
+    if raw_rtt_mode is not None:
+        print(f"  PersonaPlex {raw_rtt_mode.upper()} RTT: {breakdown.network_raw_rtt_ms:.2f}ms")
+        print(f"  Backend {raw_rtt_mode.upper()} RTT: {breakdown.backend_raw_rtt_ms:.2f}ms")
     print(f"  Opus encode ({len(speech_samples)/24000:.1f}s audio): {breakdown.opus_encode_ms:.2f}ms")
+    print(f"  Opus decode: {breakdown.opus_decode_ms:.2f}ms "
+          f"(per packet p50={_percentile(breakdown.opus_decode_packet_samples, 50):.3f}ms)")
 
-    # 3. Measure Opus decoding
-    print("\n[3/6] Measuring Opus decoding latency...")
-    opus_data, _ = measure_opus_encoding(speech_samples)
-    decode_times = []
-    for _ in range(5):
-        _, decode_time = measure_opus_decoding(opus_data)
-        decode_times.append(decode_time)
-    breakdown.opus_decode_ms = np.mean(decode_times)
-    print(f"  Opus decode: {breakdown.opus_decode_ms:.2f}ms")
+    handshake_sem = asyncio.Semaphore(max_concurrent_handshakes)
 
     # 4. Measure direct PersonaPlex latency
-    print(f"\n[4/6] Measuring direct PersonaPlex latency ({iterations} iterations)...")
-    direct_ttfts = []
-    direct_e2es = []
-    for i in range(iterations):
-        ttft, e2e = await measure_direct_personaplex(
-            speech_samples, personaplex_host, personaplex_port
-        )
-        direct_ttfts.append(ttft)
-        direct_e2es.append(e2e)
-        print(f"  Iteration {i+1}: TTFT={ttft:.1f}ms, E2E={e2e:.1f}ms")
-        await asyncio.sleep(0.5)
+    async def run_direct() -> None:
+        print(f"\n[4/6] Measuring direct PersonaPlex latency ({iterations} iterations)...")
+        for i in range(iterations):
+            ttft, e2e = await measure_direct_personaplex(
+                speech_float, personaplex_host, personaplex_port,
+                realtime_pacing=realtime_pacing,
+                handshake_sem=handshake_sem
+            )
+            breakdown.direct_ttft_samples.append(ttft)
+            breakdown.direct_e2e_samples.append(e2e)
+            print(f"  Direct iteration {i+1}: TTFT={ttft:.1f}ms, E2E={e2e:.1f}ms")
+            await asyncio.sleep(0.5)
 
-    breakdown.direct_ttft_ms = np.mean(direct_ttfts)
-    breakdown.direct_e2e_ms = np.mean(direct_e2es)
+        print(f"  Direct TTFT p50={breakdown.direct_ttft_ms:.1f}ms, p95={breakdown.direct_ttft_p95_ms:.1f}ms")
 
     # 5. Measure full pipeline latency
     # Note: Each iteration needs fresh backend restart for accurate measurement
     # because PersonaPlex keeps state between sessions
-    print(f"\n[5/6] Measuring full pipeline latency ({iterations} iterations)...")
-    print("  (Using first-connection measurements - PersonaPlex keeps state)")
-    pipeline_ttfts = []
-    pipeline_e2es = []
-    for i in range(iterations):
-        # Longer delay to let PersonaPlex state clear
-        if i > 0:
-            await asyncio.sleep(3.0)
-
-        ttft, e2e = await measure_pipeline_latency(
-            speech_bytes, backend_host, backend_port
+    async def run_pipeline() -> None:
+        print(f"\n[5/6] Measuring full pipeline latency ({iterations} iterations)...")
+        print("  (Reporting the median - a stale PersonaPlex session can produce outliers)")
+        http_client = httpx.AsyncClient(
+            base_url=f"http://{backend_host}:{backend_port}",
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
         )
-
-        # Only use reasonable measurements (< 1s for TTFT)
-        if ttft < 1000:
-            pipeline_ttfts.append(ttft)
-            pipeline_e2es.append(e2e)
-            print(f"  Iteration {i+1}: TTFT={ttft:.1f}ms, E2E={e2e:.1f}ms ✓")
-        else:
-            print(f"  Iteration {i+1}: TTFT={ttft:.1f}ms, E2E={e2e:.1f}ms (stale connection, skipped)")
-
-    if pipeline_ttfts:
-        breakdown.pipeline_ttft_ms = np.mean(pipeline_ttfts)
-        breakdown.pipeline_e2e_ms = np.mean(pipeline_e2es)
+        try:
+            for i in range(iterations):
+                # Longer delay to let PersonaPlex state clear
+                if i > 0:
+                    await asyncio.sleep(3.0)
+
+                ttft, e2e = await measure_pipeline_latency(
+                    speech_bytes, http_client, backend_host, backend_port,
+                    realtime_pacing=realtime_pacing,
+                    handshake_sem=handshake_sem
+                )
+                breakdown.pipeline_ttft_samples.append(ttft)
+                breakdown.pipeline_e2e_samples.append(e2e)
+                print(f"  Pipeline iteration {i+1}: TTFT={ttft:.1f}ms, E2E={e2e:.1f}ms")
+
+            print(f"  Pipeline TTFT p50={breakdown.pipeline_ttft_ms:.1f}ms, p95={breakdown.pipeline_ttft_p95_ms:.1f}ms")
+        finally:
+            await http_client.aclose()
+
+    if parallel_phases:
+        await asyncio.gather(run_direct(), run_pipeline())
     else:
-        print("  Warning: No valid pipeline measurements, using first iteration")
-        # Re-run once more with fresh connection
-        ttft, e2e = await measure_pipeline_latency(speech_bytes, backend_host, backend_port)
-        breakdown.pipeline_ttft_ms = ttft
-        breakdown.pipeline_e2e_ms = e2e
+        await run_direct()
+        await run_pipeline()
 
     # 6. Print summary
     print("\n[6/6] Computing breakdown...")
@@ -447,17 +742,20 @@ async def run_latency_breakdown(
     print("├─────────────────────────────────────────────────────────────────────┤")
 
     total = breakdown.pipeline_ttft_ms
+    backend_overhead = max(0.0, breakdown.backend_overhead_ms)
 
     def print_row(name: str, value: float):
         pct = (value / total * 100) if total > 0 else 0
-        bar = "█" * int(pct / 5) + "░" * (20 - int(pct / 5))
+        # Clamped so a component larger than the pipeline total keeps the table width
+        k = min(max(int(pct / 5), 0), _BAR_WIDTH)
+        bar = _FULL[:k] + _EMPTY[k:]
         print(f"│ {name:<35} │ {value:>10.2f}  │ {pct:>5.1f}% {bar} │")
 
     print_row("Direct PersonaPlex (model inference)", breakdown.direct_ttft_ms)
     print_row("Opus Encoding (PCM → Opus)", breakdown.opus_encode_ms)
     print_row("Opus Decoding (Opus → PCM)", breakdown.opus_decode_ms)
     print_row("Network RTT (TCP to PersonaPlex)", breakdown.network_rtt_ms)
-    print_row("Backend Processing Overhead", max(0, breakdown.backend_overhead_ms))
+    print_row("Backend Processing Overhead", backend_overhead)
 
     print("├─────────────────────────────────────────────────────────────────────┤")
     print_row("TOTAL PIPELINE TTFT", breakdown.pipeline_ttft_ms)
@@ -476,7 +774,7 @@ async def run_latency_breakdown(
     print("├─────────────────────────────────────────────────────────────────────┤")
     print(f"│ Raw Model Latency (Direct):      {breakdown.direct_ttft_ms:>8.2f} ms                      │")
     print(f"│ Full Pipeline Latency:           {breakdown.pipeline_ttft_ms:>8.2f} ms                      │")
-    print(f"│ Backend Overhead:                {max(0, breakdown.backend_overhead_ms):>8.2f} ms                      │")
+    print(f"│ Backend Overhead:                {backend_overhead:>8.2f} ms                      │")
     print(f"│ Encoding/Decoding Overhead:      {breakdown.total_encoding_overhead_ms:>8.2f} ms                      │")
     print("└─────────────────────────────────────────────────────────────────────┘")
 
@@ -492,25 +790,55 @@ async def main():
     parser.add_argument("--personaplex-port", type=int, default=8998)
     parser.add_argument("--backend-host", default="localhost")
     parser.add_argument("--backend-port", type=int, default=8000)
-    parser.add_argument("--output", "-o", help="Output JSON file")
+    parser.add_argument("--output", "-o",
+                        help="Output file: JSON summary, or per-iteration samples if it ends in .parquet")
+    parser.add_argument("--no-realtime-pacing", action="store_true",
+                        help="Send audio chunks back to back instead of at playback speed")
+    parser.add_argument("--parallel-phases", action="store_true",
+                        help="Run direct and pipeline measurements concurrently "
+                             "(only when the backend uses a separate PersonaPlex instance)")
+    parser.add_argument("--raw-rtt", choices=["icmp", "udp", "off"], default="off",
+                        help="Optional handshake-free RTT probe reported next to TCP connect time "
+                             "(default: off)")
+    parser.add_argument("--udp-echo-port", type=int, default=7,
+                        help="UDP echo port used by --raw-rtt udp")
+    parser.add_argument("--ws-max-concurrent-handshakes", type=int, default=16,
+                        help="Maximum WebSocket opening handshakes in flight at once")
 
     args = parser.parse_args()
 
+    # Fail before measuring rather than after the whole run
+    if args.output and args.output.endswith(".parquet") and importlib.util.find_spec("pyarrow") is None:
+        parser.error("--output *.parquet requires pyarrow (pip install pyarrow)")
+
     breakdown = await run_latency_breakdown(
         iterations=args.iterations,
         personaplex_host=args.personaplex_host,
         personaplex_port=args.personaplex_port,
         backend_host=args.backend_host,
-        backend_port=args.backend_port
+        backend_port=args.backend_port,
+        realtime_pacing=not args.no_realtime_pacing,
+        parallel_phases=args.parallel_phases,
+        raw_rtt_mode=None if args.raw_rtt == "off" else args.raw_rtt,
+        udp_echo_port=args.udp_echo_port,
+        max_concurrent_handshakes=args.ws_max_concurrent_handshakes
     )
 
     if args.output:
-        with open(args.output, 'w') as f:
-            json.dump(breakdown.to_dict(), f, indent=2)
+        if args.output.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            pq.write_table(breakdown.to_arrow(), args.output)
+        else:
+            with open(args.output, 'w') as f:
+                json.dump(breakdown.to_dict(), f, indent=2)
         print(f"\nResults saved to {args.output}")
 
     return breakdown
 
 
 if __name__ == "__main__":
+    # uvloop is optional; falls back to the default loop when missing
+    install_uvloop()
+
     asyncio.run(main())
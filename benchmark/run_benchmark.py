@@ -17,11 +17,24 @@ Usage:
 """
 import argparse
 import asyncio
+import atexit
+import itertools
 import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from datetime import datetime
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add benchmark directory to path for imports
 BENCHMARK_DIR = Path(__file__).parent.resolve()
@@ -32,16 +45,19 @@ from core import (
     PersonaPlexBenchmarkClient,
     MockPersonaPlexClient,
     BenchmarkResult,
-    SystemMetricsCollector,
+    ProcessMetricsCollector,
     print_gpu_info,
     PipelineConfig,
     PipelineBenchmarkClient,
     check_backend_health,
+    close_http,
     DirectConfig,
     DirectBenchmarkClient,
     check_personaplex_health,
 )
-from audio import TurnTakingBenchmark, AudioGenerator, SampleManager, print_sample_info
+from core.metrics import StreamingStat
+from core._eventloop import install_uvloop, running_loop_name
+from audio import TurnTakingBenchmark, AudioGenerator, SampleManager, format_sample_info, print_sample_info
 
 logging.basicConfig(
     level=logging.INFO,
@@ -50,6 +66,22 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def start_log_listener() -> logging.handlers.QueueListener:
+    """
+    Move the root logger's handlers behind a queue and a listener thread.
+
+    Console I/O then never blocks the event loop while requests are being
+    timed. The listener is stopped at exit, after flushing the queue.
+    """
+    root = logging.getLogger()
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
 # Test prompts for text benchmarking
 TEST_PROMPTS = [
     "Hello, I'd like to make a reservation.",
@@ -69,62 +101,197 @@ Help customers with reservations, menu questions, and general inquiries.
 Keep responses concise and helpful."""
 
 
+def log_sample_info(samples: list):
+    """Log sample details as one DEBUG record; skipped entirely unless --verbose."""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Audio samples:%s", "".join(format_sample_info(sample) for sample in samples))
+
+
+async def run_warmup(result: BenchmarkResult, clients: list, warmup: int, send_one) -> list:
+    """
+    Send unmeasured warm-up requests ahead of a measured run.
+
+    Each client sends its warm-up requests in turn, with clients in
+    parallel, so every connection is past its cold start (prefill cache,
+    GPU clocks, connection setup) before timing begins. The warm-up TTFTs
+    are recorded in result.config as warmup_ttfts_ms, and the first one
+    as cold_ttft_ms, so cold start stays visible without skewing the
+    measured quantiles. result.start_time is reset once the warm-up is
+    done, so the throughput figures cover only the measured requests.
+
+    Args:
+        result: Result whose config receives the warm-up figures
+        clients: Connected clients
+        warmup: Warm-up requests per client
+        send_one: Coroutine function (client, k) -> RequestMetrics sending
+            a client's k-th warm-up request
+
+    Returns:
+        TTFTs in milliseconds of the successful warm-up requests
+    """
+    result.config["warmup_requests"] = warmup
+    if warmup <= 0:
+        return []
+
+    async def warm(c) -> list:
+        return [await send_one(c, k) for k in range(warmup)]
+
+    per_client = await asyncio.gather(*(warm(c) for c in clients))
+    result.start_time = datetime.now(timezone.utc)
+    ttfts = [m.ttft * 1000 for metrics in per_client for m in metrics if m.success and m.ttft > 0]
+    if ttfts:
+        result.config["warmup_ttfts_ms"] = ttfts
+        result.config["cold_ttft_ms"] = ttfts[0]
+        logger.info(f"Warm-up: {len(ttfts)} requests, first TTFT {ttfts[0]:.1f}ms, last {ttfts[-1]:.1f}ms (not counted)")
+    return ttfts
+
+
+class ProgressLog:
+    """
+    Rate-limited progress reporting for a benchmark loop.
+
+    Logs one INFO line per ~10% of requests instead of one per request;
+    per-request details are left to DEBUG (--verbose).
+    """
+
+    def __init__(self, label: str, total: int, steps: int = 10):
+        self.label = label
+        self.total = total
+        self.done = 0
+        self._every = max(1, total // steps)
+
+    def update(self):
+        """Count one finished request."""
+        self.done += 1
+        if self.done % self._every == 0 or self.done == self.total:
+            logger.info("%s: %d/%d requests done", self.label, self.done, self.total)
+
+
+async def run_windowed(clients: list, num_iterations: int, run_one) -> None:
+    """
+    Run num_iterations requests keeping one in flight per client.
+
+    Each client gets a worker that takes the next request index from a
+    shared queue as soon as its previous request finishes, so the number
+    of in-flight requests stays at len(clients) until the queue drains.
+    Indices are handed out in order, so anything run_one takes from a
+    shared iterator before its first await lines up with the index.
+
+    Args:
+        clients: Connected benchmark clients, one request at a time each
+        num_iterations: Number of requests
+        run_one: Coroutine function called as run_one(client, index)
+    """
+    queue = asyncio.Queue()
+    for i in range(num_iterations):
+        queue.put_nowait(i)
+
+    async def worker(client):
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await run_one(client, i)
+
+    await asyncio.gather(*(worker(c) for c in clients))
+
+
 async def run_text_benchmark(
     client,
     num_iterations: int,
-    prompts: list = None
+    prompts: list = None,
+    keep_raw: bool = False,
+    warmup: int = 1
 ) -> BenchmarkResult:
     """
     Run text-based latency benchmark.
 
     Measures TTFT, ITL, and TPS for text responses.
+
+    Args:
+        client: Benchmark client, or a list of connected clients to keep
+            that many requests in flight (see run_windowed)
+        num_iterations: Number of requests
+        prompts: User inputs to cycle through (default: TEST_PROMPTS)
+        keep_raw: Keep every RequestMetrics for the per-request output;
+            otherwise only the streaming aggregates are kept
+        warmup: Unmeasured requests per client before timing (see run_warmup)
     """
     prompts = prompts or TEST_PROMPTS
+    clients = client if isinstance(client, (list, tuple)) else [client]
 
     result = BenchmarkResult(
         name="PersonaPlex Text Latency Benchmark",
         description=f"Text response latency over {num_iterations} requests",
-        start_time=datetime.utcnow(),
+        start_time=datetime.now(timezone.utc),
+        retain_requests=keep_raw,
         config={
             "num_iterations": num_iterations,
             "num_prompts": len(prompts),
             "system_prompt_length": len(SYSTEM_PROMPT),
+            "client_concurrency": len(clients),
         }
     )
 
-    logger.info(f"Starting text benchmark with {num_iterations} iterations")
+    # SYSTEM_PROMPT is the same string on every request, so after a warm-up
+    # request per connection the server can serve its prefill from cache;
+    # the first warm-up TTFT shows what a cold prefill costs
+    warmup_ttfts = await run_warmup(
+        result, clients, warmup,
+        lambda c, k: c.benchmark_text_response(
+            request_id=f"text_warmup_{k}",
+            text_prompt=SYSTEM_PROMPT,
+            user_input=prompts[k % len(prompts)]
+        )
+    )
 
-    for i in range(num_iterations):
-        prompt = prompts[i % len(prompts)]
+    logger.info(f"Starting text benchmark with {num_iterations} iterations, {len(clients)} concurrent")
+
+    prompt_cycle = itertools.cycle(prompts)
+    request_ids = [f"text_{i}" for i in range(num_iterations)]
 
-        logger.info(f"Request {i + 1}/{num_iterations}: {prompt[:50]}...")
+    async def run_one(c, i: int):
+        prompt = next(prompt_cycle)
 
-        metrics = await client.benchmark_text_response(
-            request_id=f"text_{i}",
+        metrics = await c.benchmark_text_response(
+            request_id=request_ids[i],
             text_prompt=SYSTEM_PROMPT,
-            user_input=prompt,
-            on_token=lambda t: None  # Suppress token output
+            user_input=prompt
         )
 
         result.add_request(metrics)
 
-        if metrics.success:
-            logger.info(
-                f"  TTFT: {metrics.ttft * 1000:.1f}ms, "
-                f"Tokens: {metrics.output_tokens}, "
-                f"TPS: {metrics.tps:.1f}"
+        # Logged on completion, so lines arrive in finishing order
+        if not metrics.success:
+            logger.warning("Request %d/%d failed: %s", i + 1, num_iterations, metrics.error)
+        elif debug:
+            logger.debug(
+                "Request %d/%d: %s... TTFT: %.1fms, Tokens: %d, TPS: %.1f",
+                i + 1, num_iterations, prompt[:50],
+                metrics.ttft * 1000, metrics.output_tokens, metrics.tps
             )
-        else:
-            logger.warning(f"  Request failed: {metrics.error}")
+        progress.update()
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+    progress = ProgressLog("Text benchmark", num_iterations)
+    await run_windowed(clients, num_iterations, run_one)
 
     result.compute_aggregates()
+    if warmup_ttfts and result.ttft_median > 0:
+        logger.info(
+            f"Cold TTFT {warmup_ttfts[0]:.1f}ms vs measured median {result.ttft_median:.1f}ms "
+            f"({warmup_ttfts[0] / result.ttft_median:.2f}x)"
+        )
     return result
 
 
 async def run_audio_benchmark(
     client,
     num_iterations: int,
-    use_real_samples: bool = True
+    use_real_samples: bool = True,
+    keep_raw: bool = False,
+    warmup: int = 1
 ) -> BenchmarkResult:
     """
     Run audio-based latency benchmark.
@@ -133,10 +300,14 @@ async def run_audio_benchmark(
     Uses real audio samples from PersonaPlex repository when available.
 
     Args:
-        client: Benchmark client
+        client: Benchmark client, or a list of connected clients to keep
+            that many requests in flight (see run_windowed)
         num_iterations: Number of test iterations
         use_real_samples: If True, download and use PersonaPlex test audio files
+        keep_raw: Keep every RequestMetrics for the per-request output
+        warmup: Unmeasured requests per client before timing (see run_warmup)
     """
+    clients = client if isinstance(client, (list, tuple)) else [client]
     audio_gen = AudioGenerator()
     sample_manager = SampleManager()
 
@@ -147,19 +318,18 @@ async def run_audio_benchmark(
     if use_real_samples:
         logger.info("Loading PersonaPlex test audio samples...")
         try:
-            samples = sample_manager.load_personaplex_samples()
+            samples = await sample_manager.load_personaplex_samples_async()
             real_samples = list(samples.values())
 
             # Load the service prompt if available
-            prompts = sample_manager.load_personaplex_prompts()
+            prompts = await sample_manager.load_personaplex_prompts_async()
             if "prompt_service" in prompts:
                 system_prompt = prompts["prompt_service"]
                 logger.info("Using PersonaPlex service prompt")
 
             if real_samples:
-                logger.info(f"Loaded {len(real_samples)} real audio samples:")
-                for sample in real_samples:
-                    print_sample_info(sample)
+                logger.info(f"Loaded {len(real_samples)} real audio samples")
+                log_sample_info(real_samples)
             else:
                 logger.warning("No real samples loaded, falling back to synthetic audio")
 
@@ -170,46 +340,75 @@ async def run_audio_benchmark(
     result = BenchmarkResult(
         name="PersonaPlex Audio Latency Benchmark",
         description=f"Audio turn-taking latency over {num_iterations} requests",
-        start_time=datetime.utcnow(),
+        start_time=datetime.now(timezone.utc),
+        retain_requests=keep_raw,
         config={
             "num_iterations": num_iterations,
             "sample_rate": 24000,
             "use_real_samples": bool(real_samples),
             "num_real_samples": len(real_samples),
+            "client_concurrency": len(clients),
         }
     )
 
-    logger.info(f"Starting audio benchmark with {num_iterations} iterations")
+    # generate_speech_like() is deterministic, so each synthetic
+    # duration is generated once and reused
+    synthetic_clips = {}
+
+    def synthetic_clip(duration: float) -> bytes:
+        clip = synthetic_clips.get(duration)
+        if clip is None:
+            clip = synthetic_clips[duration] = audio_gen.generate_speech_like(duration)
+        return clip
+
+    await run_warmup(
+        result, clients, warmup,
+        lambda c, k: c.benchmark_audio_latency(
+            request_id=f"audio_warmup_{k}",
+            audio_data=real_samples[k % len(real_samples)].data if real_samples else synthetic_clip(1.5),
+            text_prompt=system_prompt
+        )
+    )
 
-    for i in range(num_iterations):
+    logger.info(f"Starting audio benchmark with {num_iterations} iterations, {len(clients)} concurrent")
+
+    sample_cycle = itertools.cycle(real_samples)
+    request_ids = [f"audio_{i}" for i in range(num_iterations)]
+
+    async def run_one(c, i: int):
         # Use real sample if available, otherwise generate synthetic
         if real_samples:
-            sample = real_samples[i % len(real_samples)]
+            sample = next(sample_cycle)
             audio_data = sample.data
             audio_duration = sample.duration_seconds
             sample_name = sample.name
         else:
             audio_duration = 1.5 + (i % 3) * 0.5  # Vary duration
-            audio_data = audio_gen.generate_speech_like(audio_duration)
+            audio_data = synthetic_clip(audio_duration)
             sample_name = "synthetic"
 
-        logger.info(f"Request {i + 1}/{num_iterations}: {sample_name} ({audio_duration:.2f}s)")
-
-        metrics = await client.benchmark_audio_latency(
-            request_id=f"audio_{i}",
+        metrics = await c.benchmark_audio_latency(
+            request_id=request_ids[i],
             audio_data=audio_data,
             text_prompt=system_prompt
         )
 
         result.add_request(metrics)
 
-        if metrics.success:
-            logger.info(
-                f"  Turn-taking: {metrics.turn_taking_latency * 1000:.1f}ms, "
-                f"Tokens: {metrics.output_tokens}"
+        # Logged on completion, so lines arrive in finishing order
+        if not metrics.success:
+            logger.warning("Request %d/%d failed: %s", i + 1, num_iterations, metrics.error)
+        elif debug:
+            logger.debug(
+                "Request %d/%d: %s (%.2fs) Turn-taking: %.1fms, Tokens: %d",
+                i + 1, num_iterations, sample_name, audio_duration,
+                metrics.turn_taking_latency * 1000, metrics.output_tokens
             )
-        else:
-            logger.warning(f"  Request failed: {metrics.error}")
+        progress.update()
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+    progress = ProgressLog("Audio benchmark", num_iterations)
+    await run_windowed(clients, num_iterations, run_one)
 
     result.compute_aggregates()
     return result
@@ -229,29 +428,37 @@ async def run_turn_taking_benchmark(client, num_iterations: int) -> dict:
 async def run_pipeline_benchmark(
     config: PipelineConfig,
     num_iterations: int,
-    collect_system_metrics: bool = True
+    collect_system_metrics: bool = True,
+    concurrency: int = 1,
+    keep_raw: bool = False,
+    warmup: int = 1
 ) -> dict:
     """
     Run full pipeline benchmark through the backend.
 
     Tests: Client → Backend → PersonaPlex → Backend → Client
     Uses real audio samples from PersonaPlex repository.
+    With concurrency > 1, that many backend sessions each keep one
+    request in flight (see run_windowed). keep_raw adds the per-request
+    metrics to the results. warmup unmeasured requests per session run
+    first (see run_warmup).
     """
     sample_manager = SampleManager()
     system_collector = None
 
-    # Check backend health first
-    logger.info("Checking backend health...")
-    health = await check_backend_health(config)
+    # Check backend health and load real audio samples; both are
+    # independent I/O, so startup waits for the slower one, not the sum
+    logger.info("Checking backend health and loading PersonaPlex test audio samples...")
+    health, samples = await asyncio.gather(
+        check_backend_health(config),
+        sample_manager.load_personaplex_samples_async()
+    )
     logger.info(f"Backend health: {health}")
 
     if health.get("error"):
         logger.error(f"Backend not available: {health['error']}")
         return {"error": health["error"]}
 
-    # Load real audio samples
-    logger.info("Loading PersonaPlex test audio samples...")
-    samples = sample_manager.load_personaplex_samples()
     real_samples = list(samples.values())
 
     if not real_samples:
@@ -259,12 +466,14 @@ async def run_pipeline_benchmark(
         return {"error": "No audio samples"}
 
     logger.info(f"Loaded {len(real_samples)} audio samples")
-    for sample in real_samples:
-        print_sample_info(sample)
+    log_sample_info(real_samples)
+
+    # Trim silence once per clip, outside the timed requests
+    prepared_audio = [PipelineBenchmarkClient.prepare_audio(sample.data) for sample in real_samples]
 
     # Initialize system metrics collector
     if collect_system_metrics:
-        system_collector = SystemMetricsCollector(sample_interval=0.5)
+        system_collector = ProcessMetricsCollector(sample_interval=0.5)
         print_gpu_info()
         initial_snapshot = system_collector.get_current_snapshot()
 
@@ -272,19 +481,20 @@ async def run_pipeline_benchmark(
     result = BenchmarkResult(
         name="PersonaPlex Full Pipeline Benchmark",
         description=f"End-to-end pipeline latency over {num_iterations} requests",
-        start_time=datetime.utcnow(),
+        start_time=datetime.now(timezone.utc),
+        retain_requests=keep_raw,
         config={
             "num_iterations": num_iterations,
             "backend_url": config.base_url,
             "personaplex_connected": health.get("personaplex_running", False),
             "mode": health.get("mode", "unknown"),
             "num_samples": len(real_samples),
+            "client_concurrency": concurrency,
         }
     )
 
     results = {
         "benchmark": "pipeline",
-        "start_time": datetime.utcnow().isoformat(),
         "backend_health": health,
     }
 
@@ -298,41 +508,57 @@ async def run_pipeline_benchmark(
     if system_collector:
         system_collector.start()
 
-    # Create client and run benchmark
-    client = PipelineBenchmarkClient(config)
+    # Create clients, one backend session each, and run benchmark
+    all_clients = [PipelineBenchmarkClient(config) for _ in range(concurrency)]
 
     try:
-        connected = await client.connect()
-        if not connected:
+        connected = await asyncio.gather(*(c.connect() for c in all_clients))
+        clients = [c for c, ok in zip(all_clients, connected) if ok]
+        if not clients:
             logger.error("Failed to connect to pipeline")
             return {"error": "Connection failed"}
 
-        logger.info(f"\nStarting pipeline benchmark with {num_iterations} iterations")
+        await run_warmup(
+            result, clients, warmup,
+            lambda c, k: c.benchmark_audio_response(
+                request_id=f"pipeline_warmup_{k}",
+                audio_data=prepared_audio[k % len(prepared_audio)],
+                prepared=True
+            )
+        )
+        results["start_time"] = result.start_time.isoformat()
+
+        logger.info(f"\nStarting pipeline benchmark with {num_iterations} iterations, {len(clients)} concurrent")
         logger.info("=" * 60)
 
-        for i in range(num_iterations):
-            # Cycle through available samples
-            sample = real_samples[i % len(real_samples)]
+        # Cycle through available samples with their prepared audio
+        sample_cycle = itertools.cycle(zip(real_samples, prepared_audio))
+        request_ids = [f"pipeline_{i}" for i in range(num_iterations)]
 
-            logger.info(f"Request {i + 1}/{num_iterations}: {sample.name} ({sample.duration_seconds:.1f}s)")
+        async def run_one(client, i: int):
+            sample, audio_data = next(sample_cycle)
 
             metrics = await client.benchmark_audio_response(
-                request_id=f"pipeline_{i}",
-                audio_data=sample.data,
-                on_text=lambda t: None  # Suppress output
+                request_id=request_ids[i],
+                audio_data=audio_data,
+                prepared=True
             )
 
             result.add_request(metrics)
 
-            if metrics.success:
-                ttl = metrics.turn_taking_latency * 1000 if metrics.turn_taking_latency else 0
-                logger.info(
-                    f"  Turn-taking: {ttl:.1f}ms, "
-                    f"TTFT: {metrics.ttft * 1000:.1f}ms, "
-                    f"Tokens: {metrics.output_tokens}"
+            if not metrics.success:
+                logger.warning("Request %d/%d failed: %s", i + 1, num_iterations, metrics.error)
+            elif debug:
+                logger.debug(
+                    "Request %d/%d: %s (%.1fs) Turn-taking: %.1fms, TTFT: %.1fms, Tokens: %d",
+                    i + 1, num_iterations, sample.name, sample.duration_seconds,
+                    (metrics.turn_taking_latency or 0) * 1000, metrics.ttft * 1000, metrics.output_tokens
                 )
-            else:
-                logger.warning(f"  Request failed: {metrics.error}")
+            progress.update()
+
+        debug = logger.isEnabledFor(logging.DEBUG)
+        progress = ProgressLog("Pipeline benchmark", num_iterations)
+        await run_windowed(clients, num_iterations, run_one)
 
         result.compute_aggregates()
         results["benchmark_results"] = result.to_dict()
@@ -341,7 +567,7 @@ async def run_pipeline_benchmark(
         result.print_summary()
 
     finally:
-        await client.disconnect()
+        await asyncio.gather(*(c.disconnect() for c in all_clients))
 
         # Stop metrics collection
         if system_collector:
@@ -349,37 +575,75 @@ async def run_pipeline_benchmark(
             results["system_metrics"] = metrics_summary.to_dict()
             print_system_metrics_summary(metrics_summary)
 
-    results["end_time"] = datetime.utcnow().isoformat()
+    results["end_time"] = datetime.now(timezone.utc).isoformat()
 
     return results
 
 
+async def reconnect_when_ready(client, timeout: float = 5.0, poll_interval: float = 0.05) -> bool:
+    """
+    Reconnect a client, retrying until PersonaPlex accepts the session.
+
+    Replaces a fixed pause between sessions: the first attempt goes out
+    immediately and failed attempts are retried every poll_interval.
+    A handshake that timed out means the server still holds a session,
+    so that is not retried: another queued socket would only add to it.
+
+    Returns:
+        True once connected, False if timeout passed without success
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        if await client.connect():
+            return True
+        if client.session_busy or loop.time() >= deadline:
+            return False
+        await asyncio.sleep(poll_interval)
+
+
 async def run_direct_benchmark(
     config: DirectConfig,
     num_iterations: int = 5,
-    collect_system_metrics: bool = True
+    collect_system_metrics: bool = True,
+    concurrency: int = 1,
+    reuse_connection: bool = False,
+    keep_raw: bool = False,
+    warmup: int = 1
 ) -> dict:
     """
     Run direct PersonaPlex benchmark (bypassing backend).
 
     Connects directly to PersonaPlex to measure raw model latency
-    without backend overhead.
+    without backend overhead. PersonaPlex serves one session at a time,
+    so concurrency is clamped to 1: extra connections would only wait on
+    the server's session lock until their handshake timed out.
+
+    warmup unmeasured requests per connection run first so connection
+    and model warm-up stay out of the results (see run_warmup). By
+    default each request gets a fresh session; reuse_connection keeps
+    one connection per client for all of its requests. keep_raw adds the
+    per-request metrics to the results.
     """
+    if concurrency > 1:
+        logger.warning("PersonaPlex serves one session at a time; running direct mode with 1 connection")
+        concurrency = 1
+
     sample_manager = SampleManager()
     system_collector = None
 
-    # Check PersonaPlex health
-    logger.info("Checking PersonaPlex health...")
-    health = await check_personaplex_health(config)
+    # Check PersonaPlex health and load audio samples concurrently
+    logger.info("Checking PersonaPlex health and loading PersonaPlex test audio samples...")
+    health, samples = await asyncio.gather(
+        check_personaplex_health(config),
+        sample_manager.load_personaplex_samples_async()
+    )
     logger.info(f"PersonaPlex health: {health}")
 
     if health.get("status") != "healthy":
         logger.error(f"PersonaPlex not healthy: {health}")
         return {"error": health.get("error", "PersonaPlex unhealthy")}
 
-    # Load audio samples
-    logger.info("Loading PersonaPlex test audio samples...")
-    samples = sample_manager.load_personaplex_samples()
     real_samples = list(samples.values())
 
     if not real_samples:
@@ -387,12 +651,14 @@ async def run_direct_benchmark(
         return {"error": "No audio samples"}
 
     logger.info(f"Loaded {len(real_samples)} audio samples")
-    for sample in real_samples:
-        print_sample_info(sample)
+    log_sample_info(real_samples)
+
+    # Trim and convert each clip once, outside the timed requests
+    prepared_audio = [DirectBenchmarkClient.prepare_audio(sample.data) for sample in real_samples]
 
     # Initialize system metrics
     if collect_system_metrics:
-        system_collector = SystemMetricsCollector(sample_interval=0.5)
+        system_collector = ProcessMetricsCollector(sample_interval=0.5)
         print_gpu_info()
         initial_snapshot = system_collector.get_current_snapshot()
 
@@ -400,18 +666,20 @@ async def run_direct_benchmark(
     result = BenchmarkResult(
         name="PersonaPlex Direct Benchmark",
         description=f"Direct PersonaPlex latency (no backend) over {num_iterations} requests",
-        start_time=datetime.utcnow(),
+        start_time=datetime.now(timezone.utc),
+        retain_requests=keep_raw,
         config={
             "num_iterations": num_iterations,
             "personaplex_url": config.ws_url,
             "mode": "direct",
             "num_samples": len(real_samples),
+            "client_concurrency": concurrency,
+            "reuse_connection": reuse_connection,
         }
     )
 
     results = {
         "benchmark": "direct",
-        "start_time": datetime.utcnow().isoformat(),
         "personaplex_health": health,
     }
 
@@ -425,46 +693,78 @@ async def run_direct_benchmark(
     if system_collector:
         system_collector.start()
 
-    # Create direct client
-    client = DirectBenchmarkClient(config)
+    # Create direct clients
+    all_clients = [DirectBenchmarkClient(config) for _ in range(concurrency)]
+    # Clients whose previous request closed their connection
+    needs_reconnect = set()
 
     try:
-        connected = await client.connect()
-        if not connected:
+        connected = await asyncio.gather(*(c.connect() for c in all_clients))
+        clients = [c for c, ok in zip(all_clients, connected) if ok]
+        if not clients:
             logger.error("Failed to connect to PersonaPlex")
             return {"error": "Connection failed"}
 
-        logger.info(f"\nStarting direct benchmark with {num_iterations} iterations")
+        async def send_warmup(client, k: int):
+            if client in needs_reconnect:
+                if not await reconnect_when_ready(client):
+                    logger.warning("PersonaPlex did not accept a new session in time")
+                needs_reconnect.discard(client)
+            metrics = await client.benchmark_audio_response(
+                request_id=f"direct_warmup_{k}",
+                audio_data=prepared_audio[k % len(prepared_audio)],
+                prepared=True
+            )
+            if not reuse_connection:
+                await client.disconnect()
+                needs_reconnect.add(client)
+            return metrics
+
+        await run_warmup(result, clients, warmup, send_warmup)
+        results["start_time"] = result.start_time.isoformat()
+
+        logger.info(f"\nStarting direct benchmark with {num_iterations} iterations, {len(clients)} concurrent")
         logger.info("=" * 60)
 
-        for i in range(num_iterations):
-            sample = real_samples[i % len(real_samples)]
+        # Cycle through available samples with their prepared audio
+        sample_cycle = itertools.cycle(zip(real_samples, prepared_audio))
+        request_ids = [f"direct_{i}" for i in range(num_iterations)]
+
+        async def run_one(client, i: int):
+            # Taken before the reconnect await so samples follow request order
+            sample, audio_data = next(sample_cycle)
 
-            logger.info(f"Request {i + 1}/{num_iterations}: {sample.name} ({sample.duration_seconds:.1f}s)")
+            # Reconnect before the next request (PersonaPlex needs fresh connection)
+            if client in needs_reconnect:
+                if not await reconnect_when_ready(client):
+                    logger.warning("PersonaPlex did not accept a new session in time")
+                needs_reconnect.discard(client)
 
             metrics = await client.benchmark_audio_response(
-                request_id=f"direct_{i}",
-                audio_data=sample.data,
-                on_text=lambda t: None
+                request_id=request_ids[i],
+                audio_data=audio_data,
+                prepared=True
             )
 
             result.add_request(metrics)
 
-            if metrics.success:
-                ttl = metrics.turn_taking_latency * 1000 if metrics.turn_taking_latency else 0
-                logger.info(
-                    f"  Turn-taking: {ttl:.1f}ms, "
-                    f"TTFT: {metrics.ttft * 1000:.1f}ms, "
-                    f"Tokens: {metrics.output_tokens}"
+            if not metrics.success:
+                logger.warning("Request %d/%d failed: %s", i + 1, num_iterations, metrics.error)
+            elif debug:
+                logger.debug(
+                    "Request %d/%d: %s (%.1fs) Turn-taking: %.1fms, TTFT: %.1fms, Tokens: %d",
+                    i + 1, num_iterations, sample.name, sample.duration_seconds,
+                    (metrics.turn_taking_latency or 0) * 1000, metrics.ttft * 1000, metrics.output_tokens
                 )
-            else:
-                logger.warning(f"  Request failed: {metrics.error}")
+            progress.update()
+
+            if not reuse_connection:
+                await client.disconnect()
+                needs_reconnect.add(client)
 
-            # Reconnect for next iteration (PersonaPlex needs fresh connection)
-            await client.disconnect()
-            if i < num_iterations - 1:
-                await asyncio.sleep(0.5)
-                await client.connect()
+        debug = logger.isEnabledFor(logging.DEBUG)
+        progress = ProgressLog("Direct benchmark", num_iterations)
+        await run_windowed(clients, num_iterations, run_one)
 
         result.compute_aggregates()
         results["benchmark_results"] = result.to_dict()
@@ -472,14 +772,14 @@ async def run_direct_benchmark(
         result.print_summary()
 
     finally:
-        await client.disconnect()
+        await asyncio.gather(*(c.disconnect() for c in all_clients))
 
         if system_collector:
             metrics_summary = system_collector.stop()
             results["system_metrics"] = metrics_summary.to_dict()
             print_system_metrics_summary(metrics_summary)
 
-    results["end_time"] = datetime.utcnow().isoformat()
+    results["end_time"] = datetime.now(timezone.utc).isoformat()
 
     return results
 
@@ -492,7 +792,9 @@ async def run_throughput_benchmark(
     """
     Run throughput benchmark.
 
-    Measures sustained tokens per second over a time period.
+    Measures sustained tokens per second over a time period. Per-request
+    TTFT is folded into a streaming summary, so memory does not grow
+    with the number of requests.
     """
     logger.info(f"Starting throughput benchmark: {duration_seconds}s, concurrency={concurrency}")
 
@@ -500,21 +802,25 @@ async def run_throughput_benchmark(
         "benchmark": "throughput",
         "duration_seconds": duration_seconds,
         "concurrency": concurrency,
-        "start_time": datetime.utcnow().isoformat(),
     }
 
-    start_time = datetime.utcnow()
-    total_tokens = 0
-    total_requests = 0
-    request_id = 0
+    ttft_stat = StreamingStat()
 
-    end_time = asyncio.get_event_loop().time() + duration_seconds
+    perf_counter_ns = time.perf_counter_ns
+    start_wall = datetime.now(timezone.utc)
+    start_ns = perf_counter_ns()
+    deadline_ns = start_ns + duration_seconds * 1_000_000_000
 
-    async def worker():
-        nonlocal total_tokens, total_requests, request_id
+    async def worker(worker_idx: int) -> tuple[int, int]:
+        # Counters are per worker and summed at the end. Request IDs stride
+        # by the worker count, so they never collide across workers.
+        tokens = 0
+        requests = 0
+        request_id = worker_idx
+        prompt_cycle = itertools.islice(itertools.cycle(TEST_PROMPTS), worker_idx, None, concurrency)
 
-        while asyncio.get_event_loop().time() < end_time:
-            prompt = TEST_PROMPTS[request_id % len(TEST_PROMPTS)]
+        while perf_counter_ns() < deadline_ns:
+            prompt = next(prompt_cycle)
             metrics = await client.benchmark_text_response(
                 request_id=f"throughput_{request_id}",
                 text_prompt=SYSTEM_PROMPT,
@@ -522,24 +828,39 @@ async def run_throughput_benchmark(
             )
 
             if metrics.success:
-                total_tokens += metrics.output_tokens
-                total_requests += 1
+                tokens += metrics.output_tokens
+                requests += 1
+                if metrics.ttft > 0:
+                    ttft_stat.update(metrics.ttft * 1000)
+
+            request_id += concurrency
 
-            request_id += 1
+        return tokens, requests
 
     # Run concurrent workers
-    workers = [worker() for _ in range(concurrency)]
-    await asyncio.gather(*workers)
+    counts = await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    total_tokens = sum(tokens for tokens, _ in counts)
+    total_requests = sum(requests for _, requests in counts)
 
-    elapsed = (datetime.utcnow() - start_time).total_seconds()
+    elapsed = (perf_counter_ns() - start_ns) / 1e9
 
-    results["end_time"] = datetime.utcnow().isoformat()
+    # Both ends come from one wall-clock reading, so they agree with
+    # actual_duration_seconds exactly
+    results["start_time"] = start_wall.isoformat()
+    results["end_time"] = (start_wall + timedelta(seconds=elapsed)).isoformat()
     results["actual_duration_seconds"] = elapsed
     results["total_requests"] = total_requests
     results["total_tokens"] = total_tokens
     results["tokens_per_second"] = total_tokens / elapsed if elapsed > 0 else 0
     results["tokens_per_minute"] = results["tokens_per_second"] * 60
     results["requests_per_second"] = total_requests / elapsed if elapsed > 0 else 0
+    ttft_p50, ttft_p95, ttft_p99 = ttft_stat.percentiles([50, 95, 99])
+    results["ttft_ms"] = {
+        "mean": round(ttft_stat.mean, 2),
+        "p50": round(ttft_p50, 2),
+        "p95": round(ttft_p95, 2),
+        "p99": round(ttft_p99, 2),
+    }
 
     logger.info(f"Throughput results:")
     logger.info(f"  Requests: {total_requests}")
@@ -554,13 +875,22 @@ async def run_full_benchmark(
     client,
     text_iterations: int,
     audio_iterations: int,
-    collect_system_metrics: bool = True
+    collect_system_metrics: bool = True,
+    clients: list = None,
+    keep_raw: bool = False,
+    warmup: int = 1
 ) -> dict:
-    """Run complete benchmark suite with system metrics collection."""
+    """
+    Run complete benchmark suite with system metrics collection.
+
+    clients, if given, are used for the text and audio benchmarks instead
+    of client alone (see run_windowed). keep_raw and warmup are passed to
+    both.
+    """
     # Initialize system metrics collector
     system_collector = None
     if collect_system_metrics:
-        system_collector = SystemMetricsCollector(sample_interval=1.0)
+        system_collector = ProcessMetricsCollector(sample_interval=1.0)
 
         # Print GPU info at start
         print_gpu_info()
@@ -570,7 +900,7 @@ async def run_full_benchmark(
 
     results = {
         "benchmark_suite": "PersonaPlex Full Benchmark",
-        "start_time": datetime.utcnow().isoformat(),
+        "start_time": datetime.now(timezone.utc).isoformat(),
     }
 
     # Add initial system info
@@ -589,15 +919,21 @@ async def run_full_benchmark(
         logger.info("\n" + "=" * 60)
         logger.info("RUNNING TEXT BENCHMARK")
         logger.info("=" * 60)
-        text_result = await run_text_benchmark(client, text_iterations)
-        results["text_benchmark"] = text_result.to_dict()
+        text_result = await run_text_benchmark(
+            clients or client, text_iterations, keep_raw=keep_raw, warmup=warmup
+        )
+        results["text_benchmark"] = spill_requests(text_result)
+        del text_result
 
         # Audio benchmark
         logger.info("\n" + "=" * 60)
         logger.info("RUNNING AUDIO BENCHMARK")
         logger.info("=" * 60)
-        audio_result = await run_audio_benchmark(client, audio_iterations)
-        results["audio_benchmark"] = audio_result.to_dict()
+        audio_result = await run_audio_benchmark(
+            clients or client, audio_iterations, keep_raw=keep_raw, warmup=warmup
+        )
+        results["audio_benchmark"] = spill_requests(audio_result)
+        del audio_result
 
         # Turn-taking benchmark
         logger.info("\n" + "=" * 60)
@@ -615,11 +951,26 @@ async def run_full_benchmark(
             # Print system metrics summary
             print_system_metrics_summary(metrics_summary)
 
-    results["end_time"] = datetime.utcnow().isoformat()
+    results["end_time"] = datetime.now(timezone.utc).isoformat()
 
     return results
 
 
+async def connect_extra_clients(config: PersonaPlexConfig, count: int, mock: bool) -> list:
+    """
+    Open additional PersonaPlex clients for concurrent requests.
+
+    Clients that fail to connect are left out of the returned list.
+    """
+    client_cls = MockPersonaPlexClient if mock else PersonaPlexBenchmarkClient
+    extra = [client_cls(config) for _ in range(count)]
+    connected = await asyncio.gather(*(c.connect() for c in extra))
+    clients = [c for c, ok in zip(extra, connected) if ok]
+    if len(clients) < count:
+        logger.warning(f"Only {len(clients)}/{count} extra clients connected")
+    return clients
+
+
 def print_system_metrics_summary(summary):
     """Print system metrics summary to console."""
     print("\n" + "=" * 60)
@@ -653,23 +1004,144 @@ def print_system_metrics_summary(summary):
     print("=" * 60)
 
 
+class SpilledRequests:
+    """Per-request records of a sub-benchmark, parked in a JSON Lines file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+
+# Placeholder serialized in place of a SpilledRequests, then replaced by
+# the file's records when the document is written
+_SPILL_MARKER = "@@spilled-requests-{}@@"
+
+
+def spill_requests(result: BenchmarkResult) -> dict:
+    """
+    Convert a sub-benchmark result for the full suite, moving raw requests to disk.
+
+    Retained requests (--keep-raw) are written to a temporary JSON Lines
+    file as soon as the sub-benchmark finishes and dropped from memory, so
+    the suite holds one sub-benchmark's requests at a time. save_results()
+    splices them back into the report and removes the file.
+    """
+    if not result.requests:
+        return result.to_dict()
+
+    fd, path = tempfile.mkstemp(prefix="personaplex_requests_", suffix=".jsonl")
+    os.close(fd)
+    result.write_jsonl(path, include_header=False)
+    result.requests.clear()
+
+    data = result.to_dict()
+    data["requests"] = SpilledRequests(path)
+    return data
+
+
+def _write_spilled(f, spilled: SpilledRequests):
+    """Write a spilled requests file as a JSON array, one record at a time."""
+    f.write(b"[")
+    with open(spilled.path, "rb") as src:
+        for i, line in enumerate(src):
+            if i:
+                f.write(b",\n")
+            f.write(line.rstrip(b"\n"))
+    f.write(b"]")
+
+
 def save_results(results: dict, output_path: str):
-    """Save benchmark results to JSON file."""
+    """
+    Save benchmark results to JSON file (uses orjson when installed).
+
+    SpilledRequests values (see spill_requests) are streamed from their
+    files into the output rather than loaded back into memory.
+    """
     path = Path(output_path)
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(path, "w") as f:
-        json.dump(results, f, indent=2, default=str)
+    spilled: list[SpilledRequests] = []
+
+    def default(obj):
+        if isinstance(obj, SpilledRequests):
+            spilled.append(obj)
+            return _SPILL_MARKER.format(len(spilled) - 1)
+        return str(obj)
+
+    if orjson is not None:
+        data = orjson.dumps(
+            results,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            default=default
+        )
+    else:
+        data = json.dumps(results, indent=2, default=default).encode()
+
+    with open(path, "wb") as f:
+        pos = 0
+        for i, item in enumerate(spilled):
+            marker = f'"{_SPILL_MARKER.format(i)}"'.encode()
+            at = data.index(marker, pos)
+            f.write(data[pos:at])
+            _write_spilled(f, item)
+            pos = at + len(marker)
+        f.write(data[pos:])
+
+    for item in spilled:
+        os.unlink(item.path)
 
     logger.info(f"Results saved to: {path}")
 
 
+def save_benchmark_result(result: BenchmarkResult, output_path: str):
+    """
+    Save a BenchmarkResult, as JSON Lines if the path ends in .jsonl.
+
+    JSON Lines writes one request per line (see BenchmarkResult.write_jsonl),
+    which keeps large --keep-raw runs from being built as one document.
+    """
+    if output_path.endswith(".jsonl"):
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        result.write_jsonl(output_path)
+        logger.info(f"Results saved to: {output_path}")
+    else:
+        save_results(result.to_dict(), output_path)
+
+
 def print_summary(result: BenchmarkResult):
     """Print benchmark summary."""
     result.print_summary()
 
 
+BENCHMARK_MODES = ("text", "audio", "turn_taking", "throughput", "full", "pipeline", "direct")
+
+
+def parse_modes(value: str) -> list:
+    """Parse --mode: one benchmark mode or a comma-separated list of them."""
+    modes = [mode.strip() for mode in value.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in BENCHMARK_MODES]
+    if not modes or unknown:
+        raise argparse.ArgumentTypeError(
+            f"invalid mode {', '.join(unknown) or repr(value)} (choose from {', '.join(BENCHMARK_MODES)})"
+        )
+    return modes
+
+
+def mode_output_path(output_path: Optional[str], mode: str, several: bool) -> Optional[str]:
+    """
+    Output path for one mode's results.
+
+    When several modes run, each gets --output with the mode name added
+    before the extension (results.json -> results_text.json).
+    """
+    if not output_path or not several:
+        return output_path
+    path = Path(output_path)
+    return str(path.with_name(f"{path.stem}_{mode}{path.suffix}"))
+
+
 async def main():
+    start_log_listener()
+
     parser = argparse.ArgumentParser(
         description="PersonaPlex Performance Benchmark Suite",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -678,6 +1150,7 @@ Examples:
   python run_benchmark.py --mode text --iterations 100
   python run_benchmark.py --mode audio --iterations 50
   python run_benchmark.py --mode full --output results/benchmark.json
+  python run_benchmark.py --mode text,audio -o results/run.json  # run_text.json, run_audio.json
   python run_benchmark.py --mock --mode text  # Test with mock client
   python run_benchmark.py --mode pipeline --iterations 10  # Full pipeline test
         """
@@ -685,9 +1158,11 @@ Examples:
 
     parser.add_argument(
         "--mode",
-        choices=["text", "audio", "turn_taking", "throughput", "full", "pipeline", "direct"],
+        type=parse_modes,
         default="text",
-        help="Benchmark mode. 'direct' connects directly to PersonaPlex (no backend), 'pipeline' goes through backend."
+        help=f"Benchmark mode, or a comma-separated list run in order over one connection "
+             f"({', '.join(BENCHMARK_MODES)}). 'direct' connects directly to PersonaPlex "
+             f"(no backend), 'pipeline' goes through backend."
     )
 
     parser.add_argument(
@@ -732,7 +1207,7 @@ Examples:
     parser.add_argument(
         "--output", "-o",
         default=None,
-        help="Output file path for JSON results"
+        help="Output file path for JSON results (.jsonl for one request per line in text/audio modes)"
     )
 
     parser.add_argument(
@@ -742,6 +1217,35 @@ Examples:
         help="Concurrency level for throughput tests (default: 1)"
     )
 
+    parser.add_argument(
+        "--keep-raw",
+        action="store_true",
+        help="Include every request's metrics in the results, not just the aggregates"
+    )
+
+    parser.add_argument(
+        "--reuse-connection",
+        action="store_true",
+        help="Direct mode: keep one PersonaPlex connection for all requests "
+             "instead of a fresh session per request"
+    )
+
+    parser.add_argument(
+        "--client-concurrency",
+        type=int,
+        default=1,
+        help="Requests kept in flight for text, audio and pipeline modes, "
+             "one connection each; direct mode always uses 1 (default: 1)"
+    )
+
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="Unmeasured warm-up requests per connection before timing, for text, "
+             "audio, full, pipeline and direct modes (default: 1)"
+    )
+
     parser.add_argument(
         "--duration",
         type=int,
@@ -772,6 +1276,12 @@ Examples:
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
+    # Loop overhead shows up in TTFT jitter, so record which one is timing
+    logger.info(f"Event loop: {running_loop_name()}")
+
+    # Default report names are stamped with the run's start time (UTC)
+    run_timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+
     # Handle download-samples command
     if args.download_samples:
         logger.info("Downloading PersonaPlex test audio samples...")
@@ -786,128 +1296,143 @@ Examples:
             sys.exit(1)
         return
 
-    # Handle pipeline mode separately (uses backend, not direct PersonaPlex)
-    if args.mode == "pipeline":
-        logger.info("Running full pipeline benchmark through backend")
+    # Pipeline and direct modes open their own connections; every other
+    # mode shares one PersonaPlex client, connected once for all of them
+    client_modes = [mode for mode in args.mode if mode not in ("pipeline", "direct")]
 
-        pipeline_config = PipelineConfig(
-            backend_host=args.host,
-            backend_port=args.backend_port,
+    client = None
+    clients = []
+    if client_modes:
+        config = PersonaPlexConfig(
+            host=args.host,
+            port=args.port,
             use_ssl=args.ssl,
         )
 
-        result = await run_pipeline_benchmark(
-            pipeline_config,
-            num_iterations=args.iterations,
-            collect_system_metrics=True
-        )
-
-        if args.output:
-            save_results(result, args.output)
+        if args.mock:
+            logger.info("Using mock client")
+            client = MockPersonaPlexClient(config)
         else:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            save_results(result, f"reports/pipeline_benchmark_{timestamp}.json")
+            logger.info(f"Connecting to PersonaPlex at {config.ws_url}")
+            client = PersonaPlexBenchmarkClient(config)
 
-        logger.info("Pipeline benchmark complete!")
-        return
-
-    # Handle direct mode (connects directly to PersonaPlex, bypassing backend)
-    if args.mode == "direct":
-        logger.info("Running direct PersonaPlex benchmark (no backend)")
+        # Connect
+        connected = await client.connect()
+        if not connected and not args.mock:
+            logger.error("Failed to connect to PersonaPlex server")
+            logger.info("Use --mock to test with mock client")
+            sys.exit(1)
 
-        direct_config = DirectConfig(
-            host=args.host,
-            port=args.port,
-            use_ssl=args.ssl,
-            text_prompt=SYSTEM_PROMPT,
-        )
+        clients = [client]
+        if args.client_concurrency > 1 and any(mode in ("text", "audio", "full") for mode in client_modes):
+            clients += await connect_extra_clients(config, args.client_concurrency - 1, args.mock)
 
-        result = await run_direct_benchmark(
-            direct_config,
-            num_iterations=args.iterations,
-            collect_system_metrics=True
-        )
+    try:
+        for mode in args.mode:
+            output = mode_output_path(args.output, mode, len(args.mode) > 1)
 
-        if args.output:
-            save_results(result, args.output)
-        else:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            save_results(result, f"reports/direct_benchmark_{timestamp}.json")
+            # Pipeline mode goes through the backend, not direct PersonaPlex
+            if mode == "pipeline":
+                logger.info("Running full pipeline benchmark through backend")
 
-        logger.info("Direct benchmark complete!")
-        return
+                pipeline_config = PipelineConfig(
+                    backend_host=args.host,
+                    backend_port=args.backend_port,
+                    use_ssl=args.ssl,
+                )
 
-    # Create client for other PersonaPlex benchmarks
-    config = PersonaPlexConfig(
-        host=args.host,
-        port=args.port,
-        use_ssl=args.ssl,
-    )
+                try:
+                    result = await run_pipeline_benchmark(
+                        pipeline_config,
+                        num_iterations=args.iterations,
+                        collect_system_metrics=True,
+                        concurrency=args.client_concurrency,
+                        keep_raw=args.keep_raw,
+                        warmup=args.warmup
+                    )
+                finally:
+                    await close_http()
+
+                save_results(result, output or f"reports/pipeline_benchmark_{run_timestamp}.json")
+                logger.info("Pipeline benchmark complete!")
+
+            # Direct mode connects directly to PersonaPlex, bypassing backend
+            elif mode == "direct":
+                logger.info("Running direct PersonaPlex benchmark (no backend)")
+
+                direct_config = DirectConfig(
+                    host=args.host,
+                    port=args.port,
+                    use_ssl=args.ssl,
+                    text_prompt=SYSTEM_PROMPT,
+                )
 
-    if args.mock:
-        logger.info("Using mock client")
-        client = MockPersonaPlexClient(config)
-    else:
-        logger.info(f"Connecting to PersonaPlex at {config.ws_url}")
-        client = PersonaPlexBenchmarkClient(config)
+                result = await run_direct_benchmark(
+                    direct_config,
+                    num_iterations=args.iterations,
+                    collect_system_metrics=True,
+                    concurrency=args.client_concurrency,
+                    reuse_connection=args.reuse_connection,
+                    keep_raw=args.keep_raw,
+                    warmup=args.warmup
+                )
 
-    # Connect
-    connected = await client.connect()
-    if not connected and not args.mock:
-        logger.error("Failed to connect to PersonaPlex server")
-        logger.info("Use --mock to test with mock client")
-        sys.exit(1)
+                save_results(result, output or f"reports/direct_benchmark_{run_timestamp}.json")
+                logger.info("Direct benchmark complete!")
 
-    try:
-        # Run benchmark based on mode
-        if args.mode == "text":
-            result = await run_text_benchmark(client, args.iterations)
-            print_summary(result)
-            if args.output:
-                save_results(result.to_dict(), args.output)
-
-        elif args.mode == "audio":
-            result = await run_audio_benchmark(
-                client,
-                args.iterations,
-                use_real_samples=not args.synthetic
-            )
-            print_summary(result)
-            if args.output:
-                save_results(result.to_dict(), args.output)
-
-        elif args.mode == "turn_taking":
-            result = await run_turn_taking_benchmark(client, args.iterations)
-            if args.output:
-                save_results(result, args.output)
-
-        elif args.mode == "throughput":
-            result = await run_throughput_benchmark(
-                client,
-                duration_seconds=args.duration,
-                concurrency=args.concurrency
-            )
-            if args.output:
-                save_results(result, args.output)
-
-        elif args.mode == "full":
-            result = await run_full_benchmark(
-                client,
-                text_iterations=args.iterations,
-                audio_iterations=args.iterations // 2
-            )
-            if args.output:
-                save_results(result, args.output)
-            else:
-                # Save to default location
-                timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-                save_results(result, f"reports/benchmark_{timestamp}.json")
+            elif mode == "text":
+                result = await run_text_benchmark(
+                    clients, args.iterations, keep_raw=args.keep_raw, warmup=args.warmup
+                )
+                print_summary(result)
+                if output:
+                    save_benchmark_result(result, output)
+
+            elif mode == "audio":
+                result = await run_audio_benchmark(
+                    clients,
+                    args.iterations,
+                    use_real_samples=not args.synthetic,
+                    keep_raw=args.keep_raw,
+                    warmup=args.warmup
+                )
+                print_summary(result)
+                if output:
+                    save_benchmark_result(result, output)
+
+            elif mode == "turn_taking":
+                result = await run_turn_taking_benchmark(client, args.iterations)
+                if output:
+                    save_results(result, output)
+
+            elif mode == "throughput":
+                result = await run_throughput_benchmark(
+                    client,
+                    duration_seconds=args.duration,
+                    concurrency=args.concurrency
+                )
+                if output:
+                    save_results(result, output)
+
+            elif mode == "full":
+                result = await run_full_benchmark(
+                    client,
+                    text_iterations=args.iterations,
+                    audio_iterations=args.iterations // 2,
+                    clients=clients,
+                    keep_raw=args.keep_raw,
+                    warmup=args.warmup
+                )
+                save_results(result, output or f"reports/benchmark_{run_timestamp}.json")
 
     finally:
-        await client.disconnect()
+        await asyncio.gather(*(c.disconnect() for c in clients))
 
     logger.info("Benchmark complete!")
 
 
 if __name__ == "__main__":
+    # uvloop is optional; falls back to the default loop when missing
+    install_uvloop()
+
     asyncio.run(main())